@@ -1,4 +1,6 @@
 from .budget_analyzer import BudgetAnalyzer
 from .report_generator import ReportGenerator
+from .ledger_export import LedgerExporter
+from .consolidated_analyzer import ConsolidatedAnalyzer
 
-__all__ = ['BudgetAnalyzer', 'ReportGenerator']
+__all__ = ['BudgetAnalyzer', 'ReportGenerator', 'LedgerExporter', 'ConsolidatedAnalyzer']
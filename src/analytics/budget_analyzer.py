@@ -1,16 +1,24 @@
 from datetime import datetime, timedelta
 from typing import Dict, List, Tuple, Optional
 import csv
+import hashlib
+import json
 import os
 from pathlib import Path
 import pandas as pd
 from ..income import IncomeManager
 from ..expenses import ExpenseManager
 
+# Part of every month fingerprint; bump when the CSV/Excel report layout
+# changes so refresh_all_reports rewrites reports in the old layout
+REPORT_FORMAT_VERSION = 2
+
 class BudgetAnalyzer:
-    def __init__(self, income_manager: IncomeManager, expense_manager: ExpenseManager):
+    def __init__(self, income_manager: IncomeManager, expense_manager: ExpenseManager, recurring_manager=None):
         self.income_manager = income_manager
         self.expense_manager = expense_manager
+        # Optional RecurringManager supplying scheduled occurrences not yet in the ledger
+        self.recurring_manager = recurring_manager
 
         # Get the project root directory (2 levels up from this file)
         self.root_dir = Path(__file__).resolve().parent.parent.parent
@@ -19,10 +27,13 @@ class BudgetAnalyzer:
         self.reports_dir = self.root_dir / "reports"
         self._ensure_reports_directory()
 
-    def get_monthly_summary(self, year: int, month: int) -> Dict[str, float]:
-        """Calculate monthly summary of income, expenses, and savings"""
-        total_income = self._calculate_monthly_income(year, month)
-        total_expenses = self._calculate_monthly_expenses(year, month)
+    def get_monthly_summary(self, year: int, month: int, include_scheduled: bool = False) -> Dict[str, float]:
+        """
+        Calculate monthly summary of income, expenses, and savings.
+        include_scheduled adds recurring occurrences not yet in the ledger.
+        """
+        total_income = self._calculate_monthly_income(year, month, include_scheduled)
+        total_expenses = self._calculate_monthly_expenses(year, month, include_scheduled)
         savings = total_income - total_expenses
         
         return {
@@ -32,17 +43,18 @@ class BudgetAnalyzer:
             'savings_rate': (savings / total_income * 100) if total_income > 0 else 0
         }
 
-    def get_category_analysis(self, year: int, month: int) -> Dict[str, Dict[str, float]]:
+    def get_category_analysis(self, year: int, month: int,
+                              include_scheduled: bool = False) -> Dict[str, Dict[str, float]]:
         """Analyze spending and income by category for a specific month"""
-        income_by_category = self._get_monthly_income_by_category(year, month)
-        expenses_by_category = self._get_monthly_expenses_by_category(year, month)
+        income_by_category = self._get_monthly_income_by_category(year, month, include_scheduled)
+        expenses_by_category = self._get_monthly_expenses_by_category(year, month, include_scheduled)
         
         return {
             'income': income_by_category,
             'expenses': expenses_by_category
         }
 
-    def get_trend_analysis(self, months: int = 6) -> Dict[str, List[Dict[str, float]]]:
+    def get_trend_analysis(self, months: int = 6, include_scheduled: bool = False) -> Dict[str, List[Dict[str, float]]]:
         """Analyze trends over the specified number of months"""
         end_date = datetime.now()
         start_date = end_date - timedelta(days=30 * months)
@@ -53,7 +65,8 @@ class BudgetAnalyzer:
         while current_date <= end_date:
             month_summary = self.get_monthly_summary(
                 current_date.year,
-                current_date.month
+                current_date.month,
+                include_scheduled
             )
             monthly_data.append({
                 'year': current_date.year,
@@ -68,6 +81,90 @@ class BudgetAnalyzer:
         
         return {'monthly_trends': monthly_data}
 
+    def get_forecast(self, months: int = 3) -> Dict[str, List[Dict[str, float]]]:
+        """Summaries of the current and coming months including scheduled recurring entries"""
+        today = datetime.now()
+        year, month = today.year, today.month
+        monthly_data = []
+        for _ in range(months + 1):
+            monthly_data.append({
+                'year': year,
+                'month': month,
+                **self.get_monthly_summary(year, month, include_scheduled=True)
+            })
+            year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+        return {'monthly_forecast': monthly_data}
+
+    def get_multi_year_analysis(self, start_year: int, end_year: int) -> Dict[str, List[Dict]]:
+        """Yearly and monthly summaries for a range of years, computed in one pass over the ledgers"""
+        totals = {}
+        for key, entries in (('total_income', self.income_manager.get_all_income()),
+                             ('total_expenses', self.expense_manager.get_all_expenses())):
+            for entry in entries:
+                if start_year <= entry.date.year <= end_year:
+                    month = totals.setdefault((entry.date.year, entry.date.month),
+                                              {'total_income': 0, 'total_expenses': 0})
+                    month[key] += entry.amount
+
+        def summarize(total_income: float, total_expenses: float) -> Dict[str, float]:
+            savings = total_income - total_expenses
+            return {
+                'total_income': total_income,
+                'total_expenses': total_expenses,
+                'savings': savings,
+                'savings_rate': (savings / total_income * 100) if total_income > 0 else 0
+            }
+
+        years = []
+        for year in range(start_year, end_year + 1):
+            months = [
+                {'year': year, 'month': month, **summarize(**totals[(year, month)])}
+                for month in range(1, 13) if (year, month) in totals
+            ]
+            years.append({
+                'year': year,
+                **summarize(sum(m['total_income'] for m in months), sum(m['total_expenses'] for m in months)),
+                'months': months
+            })
+        return {'years': years}
+
+    def get_category_details(self, year: int, month: int) -> Dict[str, Dict[str, List]]:
+        """Entries of a specific month grouped by category, each group sorted by date"""
+        details = {}
+        for key, entries in (('income', self.income_manager.get_all_income()),
+                             ('expenses', self.expense_manager.get_all_expenses())):
+            by_category = {}
+            for entry in entries:
+                if entry.date.year == year and entry.date.month == month:
+                    by_category.setdefault(entry.category, []).append(entry)
+            details[key] = {
+                category: sorted(category_entries, key=lambda entry: entry.date)
+                for category, category_entries in sorted(by_category.items())
+            }
+        return details
+
+    def get_spending_statistics(self, year: int, month: int) -> Dict[str, Dict]:
+        """
+        Count, total, mean, median and 90th percentile of expenses per category
+        for a specific month, and the quantiles of all its expense amounts
+        """
+        statistics = self.expense_manager.statistics
+        return {
+            'categories': statistics.get_category_statistics(year, month),
+            'distribution': statistics.get_month_distribution(year, month)
+        }
+
+    def get_top_vendors(self, limit: int = 10, min_count: int = 2) -> List[Tuple[str, Dict[str, float]]]:
+        """All-time statistics of the vendors with the highest total spend, among those with at least min_count entries"""
+        vendors = self.expense_manager.statistics.get_vendor_statistics(min_count)
+        return sorted(vendors.items(), key=lambda item: item[1]['total'], reverse=True)[:limit]
+
+    def get_unusual_expenses(self, year: int, month: int) -> List:
+        """Expenses of a specific month that are unusually high for their category, by amount"""
+        monthly_entries = self._get_monthly_entries('expense', year, month)
+        outliers = self.expense_manager.statistics.find_outliers(monthly_entries)
+        return sorted(outliers, key=lambda entry: entry.amount, reverse=True)
+
     def _ensure_reports_directory(self) -> None:
         """Ensure the reports directory exists in the project root"""
         try:
@@ -92,6 +189,7 @@ class BudgetAnalyzer:
             # Gather all data for the report
             summary = self.get_monthly_summary(year, month)
             category_analysis = self.get_category_analysis(year, month)
+            spending_statistics = self.get_spending_statistics(year, month)['categories']
             
             # Prepare data for CSV
             with open(filepath, 'w', newline='') as csvfile:
@@ -116,6 +214,13 @@ class BudgetAnalyzer:
                 writer.writerow(['Category', 'Amount ($)'])
                 for category, amount in category_analysis['expenses'].items():
                     writer.writerow([category, f"{amount:.2f}"])
+                writer.writerow([])
+                
+                # Write expense statistics by category
+                writer.writerow(['Expense Statistics by Category'])
+                writer.writerow(['Category', 'Entries', 'Median ($)', 'P90 ($)'])
+                for category, stats in spending_statistics.items():
+                    writer.writerow([category, stats['count'], f"{stats['median']:.2f}", f"{stats['p90']:.2f}"])
             
             return str(filepath)
         except Exception as e:
@@ -138,6 +243,7 @@ class BudgetAnalyzer:
             # Gather all data for the report
             summary = self.get_monthly_summary(year, month)
             category_analysis = self.get_category_analysis(year, month)
+            spending_statistics = self.get_spending_statistics(year, month)['categories']
             
             # Create a Pandas Excel writer
             with pd.ExcelWriter(filepath, engine='openpyxl') as writer:
@@ -161,33 +267,117 @@ class BudgetAnalyzer:
                     for k, v in category_analysis['expenses'].items()
                 ])
                 expenses_df.to_excel(writer, sheet_name='Expenses by Category', index=False)
+                
+                # Expense Statistics by Category
+                statistics_df = pd.DataFrame([
+                    {'Category': k, 'Entries': v['count'], 'Median ($)': f"{v['median']:.2f}", 'P90 ($)': f"{v['p90']:.2f}"}
+                    for k, v in spending_statistics.items()
+                ])
+                statistics_df.to_excel(writer, sheet_name='Expense Statistics', index=False)
             
             return str(filepath)
         except Exception as e:
             raise RuntimeError(f"Failed to export Excel report: {str(e)}")
 
-    def _calculate_monthly_income(self, year: int, month: int) -> float:
-        """Calculate total income for a specific month"""
+    def get_month_fingerprints(self) -> Dict[Tuple[int, int], str]:
+        """
+        Fingerprint the data behind every month's report in a single pass over
+        the ledgers: entry counts, highest ids and category totals per month,
+        the expense statistics shown per category and the report format version
+        """
+        months = {}
+        for kind, entries in (('income', self.income_manager.get_all_income()),
+                              ('expenses', self.expense_manager.get_all_expenses())):
+            for entry in entries:
+                month = months.setdefault((entry.date.year, entry.date.month), {
+                    'income': {'count': 0, 'max_id': 0, 'categories': {}},
+                    'expenses': {'count': 0, 'max_id': 0, 'categories': {}},
+                })[kind]
+                month['count'] += 1
+                month['max_id'] = max(month['max_id'], entry.id or 0)
+                month['categories'][entry.category] = month['categories'].get(entry.category, 0) + entry.amount
+
+        statistics = self.expense_manager.statistics.get_monthly_category_statistics()
+        fingerprints = {}
+        for key, month in months.items():
+            for data in month.values():
+                data['categories'] = sorted((name, round(total, 2)) for name, total in data['categories'].items())
+            month['statistics'] = sorted(
+                (name, stats['count'], f"{stats['median']:.2f}", f"{stats['p90']:.2f}")
+                for name, stats in statistics.get(key, {}).items()
+            )
+            month['format_version'] = REPORT_FORMAT_VERSION
+            content = json.dumps(month, sort_keys=True)
+            fingerprints[key] = hashlib.sha256(content.encode('utf-8')).hexdigest()
+        return fingerprints
+
+    def refresh_all_reports(self, force: bool = False) -> Dict[str, List[str]]:
+        """
+        Regenerate the CSV and Excel reports of every month whose data changed
+        since they were last written, tracked in a manifest beside the reports.
+        Returns the months ('YYYY_MM') written and skipped.
+        """
+        self._ensure_reports_directory()
+        manifest_path = self.reports_dir / "report_manifest.json"
+        manifest = {}
+        if manifest_path.exists():
+            with open(manifest_path) as f:
+                manifest = json.load(f)
+
+        fingerprints = {f"{year}_{month:02d}": fingerprint
+                        for (year, month), fingerprint in self.get_month_fingerprints().items()}
+        result = {'written': [], 'skipped': []}
+        # Months that lost all their entries are regenerated once more as empty reports
+        for key in sorted(set(fingerprints) | set(manifest)):
+            fingerprint = fingerprints.get(key, 'empty')
+            year, month = (int(part) for part in key.split('_'))
+            files = [self.reports_dir / f"budget_report_{key}.csv", self.reports_dir / f"budget_report_{key}.xlsx"]
+            if not force and manifest.get(key) == fingerprint and all(path.exists() for path in files):
+                result['skipped'].append(key)
+                continue
+
+            self.export_monthly_report_to_csv(year, month)
+            self.export_monthly_report_to_excel(year, month)
+            if key in fingerprints:
+                manifest[key] = fingerprint
+            else:
+                manifest.pop(key, None)
+            result['written'].append(key)
+
+        # Replace the manifest in one step so an interrupted write can't leave it truncated
+        tmp_path = manifest_path.with_suffix('.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(manifest, f, indent=2, sort_keys=True)
+        tmp_path.replace(manifest_path)
+        return result
+
+    def _get_monthly_entries(self, kind: str, year: int, month: int, include_scheduled: bool = False) -> List:
+        """Income or expense entries of a specific month, optionally with unsaved scheduled occurrences"""
+        entries = self.income_manager.get_all_income() if kind == 'income' else self.expense_manager.get_all_expenses()
         monthly_entries = [
-            entry for entry in self.income_manager.get_all_income()
+            entry for entry in entries
             if entry.date.year == year and entry.date.month == month
         ]
+        if include_scheduled and self.recurring_manager is not None:
+            start = datetime(year, month, 1)
+            end = datetime(year + 1, 1, 1) if month == 12 else datetime(year, month + 1, 1)
+            monthly_entries.extend(self.recurring_manager.iter_virtual_entries(kind, start, end))
+        return monthly_entries
+
+    def _calculate_monthly_income(self, year: int, month: int, include_scheduled: bool = False) -> float:
+        """Calculate total income for a specific month"""
+        monthly_entries = self._get_monthly_entries('income', year, month, include_scheduled)
         return sum(entry.amount for entry in monthly_entries)
 
-    def _calculate_monthly_expenses(self, year: int, month: int) -> float:
+    def _calculate_monthly_expenses(self, year: int, month: int, include_scheduled: bool = False) -> float:
         """Calculate total expenses for a specific month"""
-        monthly_entries = [
-            entry for entry in self.expense_manager.get_all_expenses()
-            if entry.date.year == year and entry.date.month == month
-        ]
+        monthly_entries = self._get_monthly_entries('expense', year, month, include_scheduled)
         return sum(entry.amount for entry in monthly_entries)
 
-    def _get_monthly_income_by_category(self, year: int, month: int) -> Dict[str, float]:
+    def _get_monthly_income_by_category(self, year: int, month: int,
+                                        include_scheduled: bool = False) -> Dict[str, float]:
         """Get income breakdown by category for a specific month"""
-        monthly_entries = [
-            entry for entry in self.income_manager.get_all_income()
-            if entry.date.year == year and entry.date.month == month
-        ]
+        monthly_entries = self._get_monthly_entries('income', year, month, include_scheduled)
         
         category_totals = {}
         for entry in monthly_entries:
@@ -195,12 +385,10 @@ class BudgetAnalyzer:
             category_totals[category] = category_totals.get(category, 0) + entry.amount
         return category_totals
 
-    def _get_monthly_expenses_by_category(self, year: int, month: int) -> Dict[str, float]:
+    def _get_monthly_expenses_by_category(self, year: int, month: int,
+                                          include_scheduled: bool = False) -> Dict[str, float]:
         """Get expenses breakdown by category for a specific month"""
-        monthly_entries = [
-            entry for entry in self.expense_manager.get_all_expenses()
-            if entry.date.year == year and entry.date.month == month
-        ]
+        monthly_entries = self._get_monthly_entries('expense', year, month, include_scheduled)
         
         category_totals = {}
         for entry in monthly_entries:
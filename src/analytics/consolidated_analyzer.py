@@ -0,0 +1,67 @@
+# src/analytics/consolidated_analyzer.py
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional
+from ..database.multi_ledger import MultiLedgerManager, Aggregates
+
+class ConsolidatedAnalyzer:
+    """
+    BudgetAnalyzer-style summaries across every ledger of a MultiLedgerManager,
+    built from per-ledger aggregates computed in parallel. It can be passed to
+    ReportGenerator for consolidated monthly and trend reports.
+    """
+
+    def __init__(self, multi_ledger: MultiLedgerManager, ledgers: Optional[List[str]] = None):
+        self.multi_ledger = multi_ledger
+        # Restrict the analysis to some ledgers, e.g. one household member
+        self.ledgers = ledgers
+
+    def get_monthly_summary(self, year: int, month: int) -> Dict[str, float]:
+        """Calculate monthly summary of income, expenses, and savings"""
+        return self._summarize(self._aggregate_months(year, month, 1), f"{year}-{month:02d}")
+
+    def get_category_analysis(self, year: int, month: int) -> Dict[str, Dict[str, float]]:
+        """Analyze spending and income by category for a specific month"""
+        aggregates = self._aggregate_months(year, month, 1)
+        analysis = {'income': {}, 'expenses': {}}
+        for (table, _, category), (total, _) in sorted(aggregates.items()):
+            key = 'income' if table == 'income_entries' else 'expenses'
+            analysis[key][category] = analysis[key].get(category, 0) + total
+        return analysis
+
+    def get_trend_analysis(self, months: int = 6) -> Dict[str, List[Dict[str, float]]]:
+        """Analyze trends over the specified number of months"""
+        end_date = datetime.now()
+        start_date = end_date - timedelta(days=30 * months)
+        month_count = (end_date.year - start_date.year) * 12 + end_date.month - start_date.month + 1
+        aggregates = self._aggregate_months(start_date.year, start_date.month, month_count)
+
+        monthly_data = []
+        year, month = start_date.year, start_date.month
+        for _ in range(month_count):
+            monthly_data.append({
+                'year': year,
+                'month': month,
+                **self._summarize(aggregates, f"{year}-{month:02d}")
+            })
+            year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+        return {'monthly_trends': monthly_data}
+
+    def _aggregate_months(self, year: int, month: int, count: int) -> Aggregates:
+        """Aggregates for count months starting at year/month, in one parallel pass"""
+        month_index = month - 1 + count
+        end = datetime(year + month_index // 12, month_index % 12 + 1, 1)
+        return self.multi_ledger.aggregate(datetime(year, month, 1), end, self.ledgers)
+
+    @staticmethod
+    def _summarize(aggregates: Aggregates, month_key: str) -> Dict[str, float]:
+        total_income = sum(total for (table, month, _), (total, _) in aggregates.items()
+                           if table == 'income_entries' and month == month_key)
+        total_expenses = sum(total for (table, month, _), (total, _) in aggregates.items()
+                             if table == 'expense_entries' and month == month_key)
+        savings = total_income - total_expenses
+        return {
+            'total_income': total_income,
+            'total_expenses': total_expenses,
+            'savings': savings,
+            'savings_rate': (savings / total_income * 100) if total_income > 0 else 0
+        }
@@ -0,0 +1,139 @@
+# src/analytics/ledger_export.py
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+import json
+import shutil
+import pandas as pd
+from ..database.database_manager import ENTRY_TABLES
+
+def _require_pyarrow():
+    """Import pyarrow, which is only needed for Parquet export"""
+    try:
+        import pyarrow
+        import pyarrow.parquet
+        return pyarrow, pyarrow.parquet
+    except ImportError:
+        raise RuntimeError("Parquet export requires pyarrow: pip install pyarrow")
+
+class LedgerExporter:
+    """
+    Exports the raw income and expense ledgers to Parquet, partitioned as
+    <table>/year=YYYY/month=MM/part-<first id>-<last id>.parquet. Rows are
+    read from the database in chunks, and later exports only append the rows
+    added since the last one unless existing rows were edited or deleted.
+    """
+
+    MANIFEST = '_manifest.json'
+
+    def __init__(self, db_manager, export_dir: Optional[str | Path] = None, chunk_size: int = 50000):
+        self.db_manager = db_manager
+        if export_dir is None:
+            export_dir = Path(__file__).resolve().parent.parent.parent / "exports" / "ledger"
+        self.export_dir = Path(export_dir)
+        self.chunk_size = chunk_size
+
+    def export(self, full: bool = False) -> Dict[str, int]:
+        """
+        Export both ledgers, returning the number of rows written per table.
+        A table is rewritten from scratch when full is True or its data version
+        changed since the last export; otherwise only new rows are appended.
+        """
+        pa, pq = _require_pyarrow()
+        self.export_dir.mkdir(parents=True, exist_ok=True)
+        manifest = self._read_manifest()
+        written = {}
+
+        for table, party in ENTRY_TABLES.items():
+            stamp = self.db_manager.get_ledger_stamp(table)
+            state = manifest.get(table)
+            table_dir = self.export_dir / table
+            if full or state is None or state['data_version'] != stamp.data_version:
+                shutil.rmtree(table_dir, ignore_errors=True)
+                state = {'max_id': 0, 'data_version': stamp.data_version}
+
+            written[table] = 0
+            for rows in self.db_manager.iter_entry_chunks(table, self.chunk_size, after_id=state['max_id']):
+                self._write_chunk(pa, pq, table_dir, party, rows)
+                written[table] += len(rows)
+                state['max_id'] = rows[-1][0]
+                # Record progress per chunk so an interrupted export resumes
+                manifest[table] = state
+                self._write_manifest(manifest)
+
+            manifest[table] = state
+        self._write_manifest(manifest)
+        return written
+
+    def read_ledger(self, table: str, start: Optional[datetime] = None, end: Optional[datetime] = None,
+                    columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """
+        Load the exported rows of a table dated within [start, end) into pandas.
+        Only the year/month partitions overlapping the range are opened.
+        """
+        pa, pq = _require_pyarrow()
+        table_dir = self.export_dir / table
+        files = []
+        for month_dir in sorted(table_dir.glob('year=*/month=*')):
+            year = int(month_dir.parent.name.split('=')[1])
+            month = int(month_dir.name.split('=')[1])
+            month_start = datetime(year, month, 1)
+            month_end = datetime(year + 1, 1, 1) if month == 12 else datetime(year, month + 1, 1)
+            if (start is None or month_end > start) and (end is None or month_start < end):
+                files.extend(sorted(month_dir.glob('*.parquet')))
+
+        if not files:
+            return pd.DataFrame(columns=columns or ['id', 'amount', ENTRY_TABLES[table], 'date',
+                                                    'category', 'description'])
+
+        # Boundary partitions hold rows outside the range, so the date filter is
+        # pushed down to every file; the date column is read even when not requested
+        filters = []
+        if start is not None:
+            filters.append(('date', '>=', start))
+        if end is not None:
+            filters.append(('date', '<', end))
+        read_columns = None if columns is None else list(dict.fromkeys([*columns, 'date']))
+        # Partitions were chosen by hand, so don't let pyarrow add year/month columns
+        data = pa.concat_tables(
+            [pq.read_table(path, columns=read_columns, filters=filters or None, partitioning=None)
+             for path in files],
+            promote_options='default'
+        )
+        df = data.to_pandas()
+        if columns is not None and 'date' not in columns:
+            df = df.drop(columns='date')
+        return df.reset_index(drop=True)
+
+    def _write_chunk(self, pa, pq, table_dir: Path, party: str, rows: list) -> None:
+        """Write one chunk of rows, one file per year/month partition it touches"""
+        df = pd.DataFrame(rows, columns=['id', 'amount', party, 'date', 'category', 'description'])
+        df['date'] = pd.to_datetime(df['date'], format='%Y-%m-%d %H:%M:%S')
+        schema = pa.schema([
+            ('id', pa.int64()),
+            ('amount', pa.float64()),
+            (party, pa.string()),
+            ('date', pa.timestamp('s')),
+            ('category', pa.dictionary(pa.int32(), pa.string())),
+            ('description', pa.string()),
+        ])
+
+        for (year, month), group in df.groupby([df['date'].dt.year, df['date'].dt.month]):
+            partition_dir = table_dir / f"year={year}" / f"month={month:02d}"
+            partition_dir.mkdir(parents=True, exist_ok=True)
+            data = pa.Table.from_pandas(group, schema=schema, preserve_index=False)
+            pq.write_table(data, partition_dir / f"part-{group['id'].min()}-{group['id'].max()}.parquet")
+
+    def _read_manifest(self) -> dict:
+        path = self.export_dir / self.MANIFEST
+        if not path.exists():
+            return {}
+        with open(path) as f:
+            return json.load(f)
+
+    def _write_manifest(self, manifest: dict) -> None:
+        path = self.export_dir / self.MANIFEST
+        tmp_path = path.with_suffix('.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(manifest, f, indent=2)
+        tmp_path.replace(path)
@@ -1,54 +1,160 @@
 # src/analytics/report_generator.py
 from datetime import datetime
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional, TextIO
 from .budget_analyzer import BudgetAnalyzer
 
 class ReportGenerator:
+    """
+    Builds text reports. Each report type is produced by an iter_* method that
+    yields the report line by line, each line preceded by its newline, so
+    reports can be streamed into any text stream with write_report; the
+    generate_* methods join the same lines into a single string.
+    """
+
     def __init__(self, analyzer: BudgetAnalyzer):
         self.analyzer = analyzer
 
+    @staticmethod
+    def write_report(report: Iterable[str], stream: TextIO) -> None:
+        """Write a report produced by one of the iter_* methods into a text stream"""
+        for piece in report:
+            stream.write(piece)
+
+    @staticmethod
+    def _stream(lines: Iterable[str]) -> Iterator[str]:
+        for line in lines:
+            yield f"\n{line}"
+
     def generate_monthly_report(self, year: int, month: int) -> str:
         """Generate a formatted monthly financial report"""
+        return ''.join(self.iter_monthly_report(year, month))
+
+    def iter_monthly_report(self, year: int, month: int) -> Iterator[str]:
+        """Yield the monthly financial report line by line"""
+        return self._stream(self._monthly_report_lines(year, month))
+
+    def _monthly_report_lines(self, year: int, month: int) -> Iterator[str]:
         summary = self.analyzer.get_monthly_summary(year, month)
         category_analysis = self.analyzer.get_category_analysis(year, month)
-        
-        report = f"""
-Financial Report for {datetime(year, month, 1).strftime('%B %Y')}
-{'-' * 50}
-
-SUMMARY:
-Total Income:    ${summary['total_income']:.2f}
-Total Expenses:  ${summary['total_expenses']:.2f}
-Savings:         ${summary['savings']:.2f}
-Savings Rate:    {summary['savings_rate']:.1f}%
-
-INCOME BY CATEGORY:
-{'-' * 30}"""
-        
+
+        yield f"Financial Report for {datetime(year, month, 1).strftime('%B %Y')}"
+        yield '-' * 50
+        yield ""
+        yield "SUMMARY:"
+        yield f"Total Income:    ${summary['total_income']:.2f}"
+        yield f"Total Expenses:  ${summary['total_expenses']:.2f}"
+        yield f"Savings:         ${summary['savings']:.2f}"
+        yield f"Savings Rate:    {summary['savings_rate']:.1f}%"
+        yield ""
+        yield "INCOME BY CATEGORY:"
+        yield '-' * 30
+
         for category, amount in category_analysis['income'].items():
-            report += f"\n{category:<20} ${amount:>10.2f}"
-            
-        report += f"\n\nEXPENSES BY CATEGORY:\n{'-' * 30}"
-        
+            yield f"{category:<20} ${amount:>10.2f}"
+
+        yield ""
+        yield "EXPENSES BY CATEGORY:"
+        yield '-' * 30
+
         for category, amount in category_analysis['expenses'].items():
-            report += f"\n{category:<20} ${amount:>10.2f}"
-            
-        return report
+            yield f"{category:<20} ${amount:>10.2f}"
 
     def generate_trend_report(self, months: int = 6) -> str:
         """Generate a trend analysis report"""
+        return ''.join(self.iter_trend_report(months))
+
+    def iter_trend_report(self, months: int = 6) -> Iterator[str]:
+        """Yield the trend analysis report line by line"""
+        return self._stream(self._trend_report_lines(months))
+
+    def _trend_report_lines(self, months: int) -> Iterator[str]:
         trends = self.analyzer.get_trend_analysis(months)
-        
-        report = f"""
-Financial Trends Report - Last {months} Months
-{'-' * 50}\n"""
-        
+
+        yield f"Financial Trends Report - Last {months} Months"
+        yield '-' * 50
+        yield ""
+
         for data in trends['monthly_trends']:
-            month_date = datetime(data['year'], data['month'], 1)
-            report += f"\n{month_date.strftime('%B %Y')}:"
-            report += f"\n  Income:    ${data['total_income']:.2f}"
-            report += f"\n  Expenses:  ${data['total_expenses']:.2f}"
-            report += f"\n  Savings:   ${data['savings']:.2f}"
-            report += f"\n  Rate:      {data['savings_rate']:.1f}%\n"
-            
-        return report
\ No newline at end of file
+            yield from self._period_lines(datetime(data['year'], data['month'], 1).strftime('%B %Y'), data)
+            yield ""
+
+    @staticmethod
+    def _period_lines(label: str, data: Dict[str, float], indent: str = "") -> Iterator[str]:
+        yield f"{indent}{label}:"
+        yield f"{indent}  Income:    ${data['total_income']:.2f}"
+        yield f"{indent}  Expenses:  ${data['total_expenses']:.2f}"
+        yield f"{indent}  Savings:   ${data['savings']:.2f}"
+        yield f"{indent}  Rate:      {data['savings_rate']:.1f}%"
+
+    def generate_multi_year_report(self, start_year: int, end_year: Optional[int] = None) -> str:
+        """Generate a report of yearly and monthly totals over several years"""
+        return ''.join(self.iter_multi_year_report(start_year, end_year))
+
+    def iter_multi_year_report(self, start_year: int, end_year: Optional[int] = None) -> Iterator[str]:
+        """Yield the multi-year report line by line"""
+        return self._stream(self._multi_year_report_lines(start_year, end_year or start_year))
+
+    def _multi_year_report_lines(self, start_year: int, end_year: int) -> Iterator[str]:
+        analysis = self.analyzer.get_multi_year_analysis(start_year, end_year)
+
+        yield f"Financial Report {start_year} - {end_year}"
+        yield '-' * 50
+
+        for year_data in analysis['years']:
+            yield ""
+            yield from self._period_lines(str(year_data['year']), year_data)
+            yield ""
+            yield f"  {'Month':<12} {'Income':>12} {'Expenses':>12} {'Savings':>12} {'Rate':>7}"
+            for data in year_data['months']:
+                yield (f"  {datetime(data['year'], data['month'], 1).strftime('%B'):<12} "
+                       f"${data['total_income']:>11.2f} ${data['total_expenses']:>11.2f} "
+                       f"${data['savings']:>11.2f} {data['savings_rate']:>6.1f}%")
+
+    def generate_category_detail_report(self, year: int, month: int) -> str:
+        """Generate a report listing every entry of a month, grouped by category"""
+        return ''.join(self.iter_category_detail_report(year, month))
+
+    def iter_category_detail_report(self, year: int, month: int) -> Iterator[str]:
+        """Yield the per-category detail report line by line"""
+        return self._stream(self._category_detail_report_lines(year, month))
+
+    def _category_detail_report_lines(self, year: int, month: int) -> Iterator[str]:
+        details = self.analyzer.get_category_details(year, month)
+
+        yield f"Category Detail Report for {datetime(year, month, 1).strftime('%B %Y')}"
+        yield '-' * 50
+
+        for section, party_field in (('income', 'source'), ('expenses', 'vendor')):
+            yield ""
+            yield f"{section.upper()} BY CATEGORY:"
+            yield '-' * 30
+            for category, entries in details[section].items():
+                yield from self._category_entry_lines(category, entries, party_field)
+
+        statistics = self.analyzer.get_spending_statistics(year, month)['categories']
+        if statistics:
+            yield ""
+            yield "EXPENSE STATISTICS BY CATEGORY:"
+            yield '-' * 30
+            yield f"{'Category':<20} {'Entries':>8} {'Median':>11} {'P90':>11}"
+            for category, stats in statistics.items():
+                yield f"{category:<20} {stats['count']:>8} ${stats['median']:>10.2f} ${stats['p90']:>10.2f}"
+
+        unusual = self.analyzer.get_unusual_expenses(year, month)
+        if unusual:
+            yield ""
+            yield "UNUSUAL EXPENSES:"
+            yield '-' * 30
+            for entry in unusual:
+                yield (f"  {entry.date.strftime('%Y-%m-%d')}  {entry.vendor[:24]:<24} "
+                       f"${entry.amount:>10.2f}  {entry.category}")
+
+    @staticmethod
+    def _category_entry_lines(category: str, entries: List, party_field: str) -> Iterator[str]:
+        yield ""
+        yield f"{category} ({len(entries)} entries)"
+        for entry in entries:
+            description = f"  {entry.description}" if entry.description else ""
+            yield (f"  {entry.date.strftime('%Y-%m-%d')}  {getattr(entry, party_field)[:24]:<24} "
+                   f"${entry.amount:>10.2f}{description}")
+        yield f"  {'Total':<36} ${sum(entry.amount for entry in entries):>10.2f}"
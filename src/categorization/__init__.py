@@ -0,0 +1,4 @@
+from .categorization_engine import CategorizationEngine
+from .categorization_rules import CategorizationRule, RuleType
+
+__all__ = ['CategorizationEngine', 'CategorizationRule', 'RuleType']
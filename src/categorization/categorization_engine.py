@@ -0,0 +1,154 @@
+# src/categorization/categorization_engine.py
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+import re
+from .categorization_rules import CategorizationRule, RuleType
+
+NO_MATCH = float('inf')
+
+# Tokens of a regular expression: an escape, a character class, a
+# conditional group reference such as (?(1)...) or any other character
+_REGEX_TOKEN = re.compile(r'\\(.)|\[\^?\]?(?:\\.|[^\]\\])*\]|\(\?\((\d)|.', re.DOTALL)
+
+def _refers_to_group_number(pattern: str) -> bool:
+    """Whether a pattern refers to a capturing group by number, as in \\1 or (?(1)...)"""
+    for match in _REGEX_TOKEN.finditer(pattern):
+        escaped, conditional = match.groups()
+        if conditional or (escaped and escaped in '123456789'):
+            return True
+    return False
+
+class SubstringAutomaton:
+    """
+    Aho-Corasick automaton over the substring rules. A single pass over the
+    text finds the best ranked pattern it contains, whatever the number of rules.
+    """
+
+    def __init__(self, patterns: List[Tuple[str, int]]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        # Best rank of any pattern ending at a state, including via fail links
+        self._best: List[float] = [NO_MATCH]
+
+        for pattern, rank in patterns:
+            state = 0
+            for char in pattern:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._best.append(NO_MATCH)
+                state = next_state
+            self._best[state] = min(self._best[state], rank)
+
+        queue = list(self._goto[0].values())
+        for state in queue:
+            for char, next_state in self._goto[state].items():
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(char, 0)
+                self._best[next_state] = min(self._best[next_state], self._best[self._fail[next_state]])
+                queue.append(next_state)
+
+    def best_rank(self, text: str) -> float:
+        """Rank of the best pattern occurring in text, or NO_MATCH"""
+        goto, fail, best = self._goto, self._fail, self._best
+        state = 0
+        found = NO_MATCH
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if best[state] < found:
+                found = best[state]
+        return found
+
+class CategorizationEngine:
+    """
+    Categorizes income or expense entries with user-defined rules, compiled into
+    combined matchers: a dictionary for exact vendor/source names, an
+    Aho-Corasick automaton for substrings, a single merged regular expression
+    for regex rules and a priority-ordered list of amount ranges. The best
+    matching rule (lowest priority value, then earliest added) wins.
+    """
+
+    def __init__(self, rules: List[CategorizationRule]):
+        self.rules = sorted(rules, key=lambda rule: rule.priority)
+        self._exact: Dict[str, int] = {}
+        substrings = []
+        regexes = []
+        self._amount_rules: List[Tuple[int, CategorizationRule]] = []
+
+        for rank, rule in enumerate(self.rules):
+            if rule.rule_type is RuleType.EXACT:
+                self._exact.setdefault(rule.pattern.strip().lower(), rank)
+            elif rule.rule_type is RuleType.SUBSTRING and rule.pattern:
+                substrings.append((rule.pattern.lower(), rank))
+            elif rule.rule_type is RuleType.REGEX and rule.pattern and self.validate_rule(rule) is None:
+                regexes.append(f'(?P<r{rank}>{rule.pattern})')
+            elif rule.rule_type is RuleType.AMOUNT:
+                self._amount_rules.append((rank, rule))
+
+        self._substrings = SubstringAutomaton(substrings) if substrings else None
+        # Each alternative sits in a lookahead so every start position reports
+        # the best ranked regex matching there, not just the leftmost match
+        self._regex = re.compile(f"(?=(?:{'|'.join(regexes)}))", re.IGNORECASE) if regexes else None
+        # Entries mostly repeat a small set of vendors, so text matches are cached
+        self._text_rank = lru_cache(maxsize=65536)(self._scan_text)
+
+    @classmethod
+    def from_database(cls, db_connection, kind: str) -> 'CategorizationEngine':
+        """Compile the rules stored for 'income' or 'expense' entries"""
+        return cls(db_connection.get_categorization_rules(kind))
+
+    @staticmethod
+    def validate_rule(rule: CategorizationRule) -> Optional[str]:
+        """Return an error message if the rule cannot be compiled"""
+        if rule.rule_type is RuleType.AMOUNT:
+            if rule.min_amount is None and rule.max_amount is None:
+                return "Amount rules need a minimum or maximum amount"
+            return None
+        if not rule.pattern.strip():
+            return "Pattern must not be empty"
+        if rule.rule_type is RuleType.REGEX:
+            try:
+                # Compile the pattern the way it is embedded in the merged expression
+                compiled = re.compile(f'(?=(?:(?P<r0>{rule.pattern})))', re.IGNORECASE)
+            except re.error as e:
+                return f"Invalid regular expression: {e}"
+            if len(compiled.groupindex) > 1:
+                return "Regular expressions must not use named groups"
+            if _refers_to_group_number(rule.pattern):
+                # Group numbers shift once the pattern is merged with other rules
+                return "Regular expressions must not refer to groups by number"
+        return None
+
+    def categorize(self, party: str, description: str = "", amount: Optional[float] = None) -> Optional[str]:
+        """Category of the best rule matching the entry, or None if no rule matches"""
+        best = self._exact.get((party or '').strip().lower(), NO_MATCH)
+        text_rank = self._text_rank(party or '', description or '')
+        if text_rank < best:
+            best = text_rank
+        if amount is not None:
+            for rank, rule in self._amount_rules:
+                if rank >= best:
+                    break
+                if rule.matches_amount(amount):
+                    best = rank
+                    break
+        return None if best == NO_MATCH else self.rules[best].category
+
+    def _scan_text(self, party: str, description: str) -> float:
+        text = f"{party}\n{description}"
+        best = NO_MATCH
+        if self._substrings is not None:
+            best = self._substrings.best_rank(text.lower())
+        if self._regex is not None:
+            for match in self._regex.finditer(text):
+                rank = int(match.lastgroup[1:])
+                if rank < best:
+                    best = rank
+        return best
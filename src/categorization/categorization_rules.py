@@ -0,0 +1,53 @@
+# src/categorization/categorization_rules.py
+from dataclasses import dataclass
+from enum import Enum
+from typing import Optional
+
+class RuleType(Enum):
+    EXACT = "Vendor/source name equals the pattern"
+    SUBSTRING = "Vendor/source name or description contains the pattern"
+    REGEX = "Vendor/source name or description matches the regular expression"
+    AMOUNT = "Amount lies within the minimum/maximum range"
+
+@dataclass
+class CategorizationRule:
+    """A user-defined rule assigning a category to matching income or expense entries"""
+    kind: str                  # 'income' or 'expense'
+    rule_type: RuleType
+    category: str
+    pattern: str = ""
+    min_amount: Optional[float] = None
+    max_amount: Optional[float] = None
+    priority: int = 100        # Lower values win when several rules match
+    id: Optional[int] = None
+
+    def matches_amount(self, amount: float) -> bool:
+        """Check if an amount lies within the rule's range"""
+        return ((self.min_amount is None or amount >= self.min_amount) and
+                (self.max_amount is None or amount <= self.max_amount))
+
+    def to_dict(self) -> dict:
+        """Convert the rule to a dictionary"""
+        return {
+            'kind': self.kind,
+            'rule_type': self.rule_type.name,
+            'category': self.category,
+            'pattern': self.pattern,
+            'min_amount': self.min_amount,
+            'max_amount': self.max_amount,
+            'priority': self.priority
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'CategorizationRule':
+        """Create a CategorizationRule instance from a dictionary"""
+        return cls(
+            kind=data['kind'],
+            rule_type=RuleType[data['rule_type']],
+            category=data['category'],
+            pattern=data.get('pattern') or '',
+            min_amount=data.get('min_amount'),
+            max_amount=data.get('max_amount'),
+            priority=data.get('priority', 100),
+            id=data.get('id')
+        )
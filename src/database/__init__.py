@@ -1 +1,5 @@
-from .database_manager import DatabaseManager
\ No newline at end of file
+from .database_manager import DatabaseManager
+from .deduplication import DuplicatePolicy, ImportResult
+from .multi_ledger import MultiLedgerManager
+
+__all__ = ['DatabaseManager', 'DuplicatePolicy', 'ImportResult', 'MultiLedgerManager']
\ No newline at end of file
@@ -1,17 +1,54 @@
 # src/database/database_manager.py
-from typing import Optional
+from typing import Callable, Optional, Iterator
+import heapq
+import json
 import sqlite3
+import threading
+from contextlib import contextmanager
 from datetime import datetime
 from pathlib import Path
 from src.settings import DATABASE
+from .ledger_snapshot import LedgerSnapshot, LedgerStamp
+from .deduplication import DuplicatePolicy, ImportResult, fingerprint_entry, FINGERPRINT_VERSION
+from ..categorization.categorization_rules import CategorizationRule
+
+# Tables mirrored into the in-memory replica, with the column identifying a row
+REPLICATED_TABLES = {
+    'income_entries': 'id',
+    'expense_entries': 'id',
+    'custom_income_categories': 'name',
+    'custom_expense_categories': 'name',
+    'ledger_meta': 'table_name',
+    'categorization_rules': 'id',
+    'recurring_schedules': 'id',
+}
+
+# Entry tables and the column naming the counterparty of each entry
+ENTRY_TABLES = {
+    'income_entries': 'source',
+    'expense_entries': 'vendor',
+}
+
+# spend_sketches row holding the expense ledger write count the stored sketches reflect
+SKETCH_STAMP_KEY = 'ledger'
+
+# Hook run inside an entries write transaction right before it commits, with
+# the cursor, the table and the ids of the rows written and deleted
+BeforeCommit = Callable[[sqlite3.Cursor, str, list, list], None]
+
+# Keep replayed IN (...) lists well under SQLite's bound parameter limit
+REPLICATION_CHUNK_SIZE = 500
 
 class DatabaseManager:
-    def __init__(self, db_path: Optional[str | Path] = None):
+    def __init__(self, db_path: Optional[str | Path] = None, memory_replica: Optional[bool] = None,
+                 ledger_snapshot: Optional[bool] = None):
         if db_path is None:
             db_path = DATABASE['path']
-        
-        # Ensure the data directory exists
-        db_path.parent.mkdir(parents=True, exist_ok=True)
+        if memory_replica is None:
+            memory_replica = DATABASE.get('memory_replica', False)
+        if ledger_snapshot is None:
+            ledger_snapshot = DATABASE.get('ledger_snapshot', False)
+        self.ledger_snapshot = ledger_snapshot
         
         self.db_path = Path(db_path).resolve()  # Convert to absolute path
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
@@ -19,6 +56,16 @@ class DatabaseManager:
         # Initialize the database
         self._init_database()
 
+        # Fingerprint -> id of every non-duplicate entry, per entries table
+        self._fingerprint_index = {}
+
+        # Optional in-memory copy that serves all read queries
+        self._replica = None
+        self._replica_lock = threading.Lock()
+        if memory_replica:
+            self._replica = sqlite3.connect(':memory:', check_same_thread=False)
+            self.refresh_replica()
+
     def _init_database(self) -> None:
         """Initialize the database with required tables"""
         with sqlite3.connect(self.db_path) as conn:
@@ -32,7 +79,9 @@ class DatabaseManager:
                     source TEXT NOT NULL,
                     date TIMESTAMP NOT NULL,
                     category TEXT NOT NULL,
-                    description TEXT
+                    description TEXT,
+                    fingerprint TEXT,
+                    duplicate_of INTEGER
                 )
             ''')
             
@@ -44,7 +93,9 @@ class DatabaseManager:
                     vendor TEXT NOT NULL,
                     date TIMESTAMP NOT NULL,
                     category TEXT NOT NULL,
-                    description TEXT
+                    description TEXT,
+                    fingerprint TEXT,
+                    duplicate_of INTEGER
                 )
             ''')
             
@@ -64,56 +115,610 @@ class DatabaseManager:
                 )
             ''')
             
+            self._migrate_entry_tables(cursor)
+            
+            # Create categorization rules table
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS categorization_rules (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    kind TEXT NOT NULL,
+                    rule_type TEXT NOT NULL,
+                    category TEXT NOT NULL,
+                    pattern TEXT,
+                    min_amount REAL,
+                    max_amount REAL,
+                    priority INTEGER NOT NULL DEFAULT 100
+                )
+            ''')
+            
+            # Create recurring schedules table
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS recurring_schedules (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    kind TEXT NOT NULL,
+                    amount REAL NOT NULL,
+                    party TEXT NOT NULL,
+                    category TEXT NOT NULL,
+                    cadence TEXT NOT NULL,
+                    start_date TIMESTAMP NOT NULL,
+                    end_date TIMESTAMP,
+                    description TEXT,
+                    last_materialized TIMESTAMP
+                )
+            ''')
+            
+            # Per-table counters: data_version is bumped by any change that is
+            # not a plain append, so cached copies of a table can tell edits from
+            # new rows; write_count is bumped by every write transaction
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS ledger_meta (
+                    table_name TEXT PRIMARY KEY,
+                    data_version INTEGER NOT NULL DEFAULT 0,
+                    write_count INTEGER NOT NULL DEFAULT 0
+                )
+            ''')
+            cursor.execute('PRAGMA table_info(ledger_meta)')
+            if 'write_count' not in {row[1] for row in cursor.fetchall()}:
+                cursor.execute('ALTER TABLE ledger_meta ADD COLUMN write_count INTEGER NOT NULL DEFAULT 0')
+            
+            # Serialized quantile sketches of expense amounts, see src/stats
+            cursor.execute('''
+                CREATE TABLE IF NOT EXISTS spend_sketches (
+                    sketch_key TEXT PRIMARY KEY,
+                    sketch TEXT NOT NULL
+                )
+            ''')
+            
             conn.commit()
 
-    def add_income_entry(self, entry_data: dict) -> int:
-        """Add a new income entry to the database"""
+    def _migrate_entry_tables(self, cursor: sqlite3.Cursor) -> None:
+        """
+        Add the duplicate detection columns to databases created before they
+        existed, fingerprint their rows and create the unique fingerprint index.
+        Rows matching an earlier row are flagged rather than rejected. Rows
+        fingerprinted by an older FINGERPRINT_VERSION are fingerprinted again.
+        """
+        cursor.execute('PRAGMA user_version')
+        outdated = cursor.fetchone()[0] < FINGERPRINT_VERSION
+        for table, party in ENTRY_TABLES.items():
+            cursor.execute(f'PRAGMA table_info({table})')
+            columns = {row[1] for row in cursor.fetchall()}
+            if 'fingerprint' not in columns:
+                cursor.execute(f'ALTER TABLE {table} ADD COLUMN fingerprint TEXT')
+            if 'duplicate_of' not in columns:
+                cursor.execute(f'ALTER TABLE {table} ADD COLUMN duplicate_of INTEGER')
+            if outdated:
+                cursor.execute(f'UPDATE {table} SET fingerprint = NULL, duplicate_of = NULL')
+
+            cursor.execute(f'''
+                SELECT id, amount, {party}, date, description FROM {table}
+                WHERE fingerprint IS NULL ORDER BY id
+            ''')
+            pending = cursor.fetchall()
+            if pending:
+                cursor.execute(f'SELECT fingerprint, id FROM {table} WHERE fingerprint IS NOT NULL AND duplicate_of IS NULL')
+                known = dict(cursor.fetchall())
+                updates = []
+                for row_id, amount, party_value, date, description in pending:
+                    fingerprint = fingerprint_entry(
+                        {'amount': amount, party: party_value, 'date': date, 'description': description}, party
+                    )
+                    updates.append((fingerprint, known.get(fingerprint), row_id))
+                    known.setdefault(fingerprint, row_id)
+                cursor.executemany(f'UPDATE {table} SET fingerprint = ?, duplicate_of = ? WHERE id = ?', updates)
+
+            cursor.execute(f'''
+                CREATE UNIQUE INDEX IF NOT EXISTS idx_{table}_fingerprint
+                ON {table} (fingerprint) WHERE duplicate_of IS NULL
+            ''')
+        cursor.execute(f'PRAGMA user_version = {FINGERPRINT_VERSION}')
+
+    @property
+    def has_replica(self) -> bool:
+        """Whether read queries are served from the in-memory replica"""
+        return self._replica is not None
+
+    def refresh_replica(self) -> None:
+        """Reload the in-memory replica from the on-disk database using the backup API"""
+        if self._replica is None:
+            return
+        with sqlite3.connect(self.db_path) as conn:
+            with self._replica_lock:
+                conn.backup(self._replica)
+
+    def check_replica_consistency(self, refresh: bool = False) -> bool:
+        """
+        Compare row counts and highest keys of the replica against the on-disk database.
+        Writes made by other processes are not replayed, so a stale replica is
+        reloaded when refresh is True.
+        """
+        if self._replica is None:
+            return True
+
+        def table_stamps(conn) -> dict:
+            return {
+                table: conn.execute(f'SELECT COUNT(*), MAX({key}) FROM {table}').fetchone()
+                for table, key in REPLICATED_TABLES.items()
+            }
+
+        with sqlite3.connect(self.db_path) as conn:
+            disk_stamps = table_stamps(conn)
+        with self._replica_lock:
+            replica_stamps = table_stamps(self._replica)
+
+        consistent = disk_stamps == replica_stamps
+        if not consistent and refresh:
+            self.refresh_replica()
+        return consistent
+
+    @contextmanager
+    def _read_connection(self) -> Iterator[sqlite3.Connection]:
+        """Connection for read queries: the replica when enabled, otherwise the on-disk database"""
+        if self._replica is not None:
+            with self._replica_lock:
+                yield self._replica
+        else:
+            with sqlite3.connect(self.db_path) as conn:
+                yield conn
+
+    def _replicate_rows(self, conn: sqlite3.Connection, table: str, keys: list) -> None:
+        """Replay committed rows from the on-disk connection into the replica"""
+        if self._replica is None or not keys:
+            return
+        key = REPLICATED_TABLES[table]
+        with self._replica_lock:
+            for start in range(0, len(keys), REPLICATION_CHUNK_SIZE):
+                chunk = keys[start:start + REPLICATION_CHUNK_SIZE]
+                placeholders = ', '.join('?' * len(chunk))
+                rows = conn.execute(
+                    f'SELECT * FROM {table} WHERE {key} IN ({placeholders})', chunk
+                ).fetchall()
+                if rows:
+                    values = ', '.join('?' * len(rows[0]))
+                    self._replica.executemany(f'INSERT OR REPLACE INTO {table} VALUES ({values})', rows)
+            self._replica.commit()
+
+    def _replicate_deletes(self, table: str, keys: list) -> None:
+        """Remove deleted rows from the replica"""
+        if self._replica is None or not keys:
+            return
+        key = REPLICATED_TABLES[table]
+        with self._replica_lock:
+            self._replica.executemany(f'DELETE FROM {table} WHERE {key} = ?', [(k,) for k in keys])
+            self._replica.commit()
+
+    # Every entries write below accepts an optional before_commit hook (see
+    # BeforeCommit) for callers keeping derived data in the same transaction
+
+    def add_income_entry(self, entry_data: dict, before_commit: Optional[BeforeCommit] = None) -> int:
+        """Add a new income entry to the database, flagging it if it duplicates an existing one"""
+        return self.add_income_entries([entry_data], DuplicatePolicy.FLAG, before_commit).entry_ids[0]
+
+    def add_income_entries(self, entries: list, policy: DuplicatePolicy = DuplicatePolicy.SKIP,
+                           before_commit: Optional[BeforeCommit] = None) -> ImportResult:
+        """Add income entries in a single transaction, resolving duplicates according to policy"""
+        return self._add_entries('income_entries', entries, policy, before_commit)
+
+    def add_expense_entry(self, entry_data: dict, before_commit: Optional[BeforeCommit] = None) -> int:
+        """Add a new expense entry to the database, flagging it if it duplicates an existing one"""
+        return self.add_expense_entries([entry_data], DuplicatePolicy.FLAG, before_commit).entry_ids[0]
+
+    def add_expense_entries(self, entries: list, policy: DuplicatePolicy = DuplicatePolicy.SKIP,
+                            before_commit: Optional[BeforeCommit] = None) -> ImportResult:
+        """Add expense entries in a single transaction, resolving duplicates according to policy"""
+        return self._add_entries('expense_entries', entries, policy, before_commit)
+
+    def update_income_entries(self, updates: dict, before_commit: Optional[BeforeCommit] = None) -> int:
+        """
+        Replace the stored fields of income entries, keyed by id, in one
+        transaction. Raises KeyError, changing nothing, if an id does not exist.
+        """
+        return self._update_entries('income_entries', updates, before_commit)
+
+    def update_expense_entries(self, updates: dict, before_commit: Optional[BeforeCommit] = None) -> int:
+        """
+        Replace the stored fields of expense entries, keyed by id, in one
+        transaction. Raises KeyError, changing nothing, if an id does not exist.
+        """
+        return self._update_entries('expense_entries', updates, before_commit)
+
+    def delete_income_entries(self, entry_ids: list, before_commit: Optional[BeforeCommit] = None) -> int:
+        """Delete income entries by id in one transaction"""
+        return self._delete_entries('income_entries', entry_ids, before_commit)
+
+    def delete_expense_entries(self, entry_ids: list, before_commit: Optional[BeforeCommit] = None) -> int:
+        """Delete expense entries by id in one transaction"""
+        return self._delete_entries('expense_entries', entry_ids, before_commit)
+
+    def _add_entries(self, table: str, entries: list, policy: DuplicatePolicy,
+                     before_commit: Optional[BeforeCommit] = None) -> ImportResult:
+        """Insert entry dictionaries into an entries table in one transaction"""
+        result = ImportResult()
+        touched = []
         with sqlite3.connect(self.db_path) as conn:
             cursor = conn.cursor()
-            cursor.execute('''
-                INSERT INTO income_entries (amount, source, date, category, description)
-                VALUES (?, ?, ?, ?, ?)
+            known = self._get_fingerprint_index(conn, table)
+            try:
+                self._insert_entries(cursor, table, entries, policy, known, result, touched)
+            except Exception:
+                # The index may now hold rows that were rolled back
+                self._fingerprint_index.pop(table, None)
+                raise
+
+            if result.duplicates_merged:
+                self._bump_data_version(cursor, table)
+            self._record_write(cursor, table, touched, [], before_commit)
+            conn.commit()
+            self._replicate_rows(conn, table, touched)
+            self._replicate_rows(conn, 'ledger_meta', [table])
+        return result
+
+    def _insert_entries(self, cursor: sqlite3.Cursor, table: str, entries: list, policy: DuplicatePolicy,
+                        known: dict, result: ImportResult, touched: list) -> None:
+        """Resolve and write each incoming entry, recording the outcome in result"""
+        party = ENTRY_TABLES[table]
+        for entry_data in entries:
+            fingerprint = fingerprint_entry(entry_data, party)
+            existing_id = known.get(fingerprint)
+            if existing_id is None:
+                existing_id = self._insert_entry(cursor, table, entry_data, fingerprint)
+                if existing_id is None:
+                    known[fingerprint] = cursor.lastrowid
+                    result.entry_ids.append(cursor.lastrowid)
+                    result.inserted += 1
+                    touched.append(cursor.lastrowid)
+                    continue
+                # Inserted by another connection since the index was loaded
+                known[fingerprint] = existing_id
+
+            if policy is DuplicatePolicy.SKIP:
+                result.entry_ids.append(None)
+                result.duplicates_skipped += 1
+            elif policy is DuplicatePolicy.FLAG:
+                self._insert_entry(cursor, table, entry_data, fingerprint, duplicate_of=existing_id)
+                result.entry_ids.append(cursor.lastrowid)
+                result.duplicates_flagged += 1
+                touched.append(cursor.lastrowid)
+            else:
+                cursor.execute(f'UPDATE {table} SET date = ?, category = ? WHERE id = ?',
+                               (entry_data['date'], entry_data['category'], existing_id))
+                result.entry_ids.append(existing_id)
+                result.duplicates_merged += 1
+                result.merged_ids.add(existing_id)
+                touched.append(existing_id)
+
+    def _insert_entry(self, cursor: sqlite3.Cursor, table: str, entry_data: dict, fingerprint: str,
+                      duplicate_of: Optional[int] = None) -> Optional[int]:
+        """
+        Insert one entry row. Returns None on success, or the id of the row
+        already holding the fingerprint if the unique index rejected it.
+        """
+        party = ENTRY_TABLES[table]
+        try:
+            cursor.execute(f'''
+                INSERT INTO {table} (amount, {party}, date, category, description, fingerprint, duplicate_of)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
             ''', (
                 entry_data['amount'],
-                entry_data['source'],
+                entry_data[party],
                 entry_data['date'],
                 entry_data['category'],
-                entry_data.get('description', '')
+                entry_data.get('description', ''),
+                fingerprint,
+                duplicate_of
             ))
+            return None
+        except sqlite3.IntegrityError:
+            cursor.execute(f'SELECT id FROM {table} WHERE fingerprint = ? AND duplicate_of IS NULL', (fingerprint,))
+            existing = cursor.fetchone()
+            if existing is None:
+                raise
+            return existing[0]
+
+    def materialize_recurring_entries(self, income_entries: list, expense_entries: list, schedule_marks: list,
+                                      before_commit: Optional[BeforeCommit] = None) -> tuple:
+        """
+        Insert generated income and expense entries and record (last_materialized,
+        schedule id) marks in a single transaction. Entries matching an existing
+        one are skipped. Returns the ImportResult of the income and expense entries.
+        """
+        results = {'income_entries': ImportResult(), 'expense_entries': ImportResult()}
+        touched = {'income_entries': [], 'expense_entries': []}
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            try:
+                for table, entries in (('income_entries', income_entries), ('expense_entries', expense_entries)):
+                    if not entries:
+                        continue
+                    known = self._get_fingerprint_index(conn, table)
+                    self._insert_entries(cursor, table, entries, DuplicatePolicy.SKIP,
+                                         known, results[table], touched[table])
+                    self._record_write(cursor, table, touched[table], [], before_commit)
+            except Exception:
+                self._fingerprint_index.clear()
+                raise
+            cursor.executemany('UPDATE recurring_schedules SET last_materialized = ? WHERE id = ?', schedule_marks)
             conn.commit()
-            return cursor.lastrowid
+            for table, ids in touched.items():
+                self._replicate_rows(conn, table, ids)
+            self._replicate_rows(conn, 'ledger_meta', [table for table, ids in touched.items() if ids])
+            self._replicate_rows(conn, 'recurring_schedules', [schedule_id for _, schedule_id in schedule_marks])
+        return results['income_entries'], results['expense_entries']
 
-    def add_expense_entry(self, entry_data: dict) -> int:
-        """Add a new expense entry to the database"""
+    def _update_entries(self, table: str, updates: dict, before_commit: Optional[BeforeCommit] = None) -> int:
+        """Write entry dictionaries over existing rows, keeping duplicate tracking consistent"""
+        if not updates:
+            return 0
+        party = ENTRY_TABLES[table]
+        touched = []
         with sqlite3.connect(self.db_path) as conn:
             cursor = conn.cursor()
-            cursor.execute('''
-                INSERT INTO expense_entries (amount, vendor, date, category, description)
-                VALUES (?, ?, ?, ?, ?)
-            ''', (
-                entry_data['amount'],
-                entry_data['vendor'],
-                entry_data['date'],
-                entry_data['category'],
-                entry_data.get('description', '')
-            ))
+            missing = self._missing_ids(cursor, table, list(updates))
+            if missing:
+                raise KeyError(f"No {table} rows with ids {missing}")
+            known = self._get_fingerprint_index(conn, table)
+            try:
+                for entry_id, entry_data in updates.items():
+                    cursor.execute(f'SELECT fingerprint, duplicate_of FROM {table} WHERE id = ?', (entry_id,))
+                    old_fingerprint, duplicate_of = cursor.fetchone()
+                    fingerprint = fingerprint_entry(entry_data, party)
+                    if fingerprint != old_fingerprint:
+                        owner = known.get(fingerprint)
+                        if owner is None:
+                            known[fingerprint] = entry_id
+                        new_duplicate_of = owner
+                    else:
+                        new_duplicate_of = duplicate_of
+
+                    cursor.execute(f'''
+                        UPDATE {table}
+                        SET amount = ?, {party} = ?, date = ?, category = ?, description = ?,
+                            fingerprint = ?, duplicate_of = ?
+                        WHERE id = ?
+                    ''', (
+                        entry_data['amount'],
+                        entry_data[party],
+                        entry_data['date'],
+                        entry_data['category'],
+                        entry_data.get('description', ''),
+                        fingerprint,
+                        new_duplicate_of,
+                        entry_id
+                    ))
+                    touched.append(entry_id)
+                    if fingerprint != old_fingerprint and duplicate_of is None:
+                        touched.extend(self._release_fingerprint(cursor, table, entry_id, old_fingerprint, known))
+            except Exception:
+                self._fingerprint_index.pop(table, None)
+                raise
+
+            self._bump_data_version(cursor, table)
+            self._record_write(cursor, table, touched, [], before_commit)
             conn.commit()
-            return cursor.lastrowid
+            self._replicate_rows(conn, table, touched)
+            self._replicate_rows(conn, 'ledger_meta', [table])
+        return len(updates)
+
+    def _missing_ids(self, cursor: sqlite3.Cursor, table: str, entry_ids: list) -> list:
+        """The ids among entry_ids that have no row in table"""
+        found = set()
+        for start in range(0, len(entry_ids), REPLICATION_CHUNK_SIZE):
+            chunk = entry_ids[start:start + REPLICATION_CHUNK_SIZE]
+            placeholders = ', '.join('?' * len(chunk))
+            cursor.execute(f'SELECT id FROM {table} WHERE id IN ({placeholders})', chunk)
+            found.update(row[0] for row in cursor.fetchall())
+        return [entry_id for entry_id in entry_ids if entry_id not in found]
+
+    def _delete_entries(self, table: str, entry_ids: list, before_commit: Optional[BeforeCommit] = None) -> int:
+        """Delete rows by id, promoting a flagged duplicate of each deleted row in its place"""
+        if not entry_ids:
+            return 0
+        deleted = []
+        touched = []
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            known = self._get_fingerprint_index(conn, table)
+            try:
+                for entry_id in entry_ids:
+                    cursor.execute(f'SELECT fingerprint, duplicate_of FROM {table} WHERE id = ?', (entry_id,))
+                    row = cursor.fetchone()
+                    if row is None:
+                        continue
+                    cursor.execute(f'DELETE FROM {table} WHERE id = ?', (entry_id,))
+                    deleted.append(entry_id)
+                    if row[1] is None:
+                        touched.extend(self._release_fingerprint(cursor, table, entry_id, row[0], known))
+            except Exception:
+                self._fingerprint_index.pop(table, None)
+                raise
+
+            changed = [entry_id for entry_id in touched if entry_id not in deleted]
+            self._bump_data_version(cursor, table)
+            self._record_write(cursor, table, changed, deleted, before_commit)
+            conn.commit()
+            self._replicate_deletes(table, list(entry_ids))
+            self._replicate_rows(conn, table, changed)
+            self._replicate_rows(conn, 'ledger_meta', [table])
+        return len(deleted)
+
+    def _release_fingerprint(self, cursor: sqlite3.Cursor, table: str, entry_id: int,
+                             fingerprint: str, known: dict) -> list:
+        """
+        Hand a fingerprint given up by a row to the oldest entry flagged as its
+        duplicate, re-pointing the other flagged entries. Returns the changed ids.
+        """
+        cursor.execute(f'SELECT id FROM {table} WHERE duplicate_of = ? ORDER BY id', (entry_id,))
+        duplicates = [row[0] for row in cursor.fetchall()]
+        if not duplicates:
+            if known.get(fingerprint) == entry_id:
+                del known[fingerprint]
+            return []
+        new_owner = duplicates[0]
+        cursor.execute(f'UPDATE {table} SET duplicate_of = NULL WHERE id = ?', (new_owner,))
+        cursor.execute(f'UPDATE {table} SET duplicate_of = ? WHERE duplicate_of = ?', (new_owner, entry_id))
+        known[fingerprint] = new_owner
+        return duplicates
+
+    def _get_fingerprint_index(self, conn: sqlite3.Connection, table: str) -> dict:
+        """In-memory fingerprint -> id index of an entries table, loaded on first use"""
+        index = self._fingerprint_index.get(table)
+        if index is None:
+            cursor = conn.execute(f'SELECT fingerprint, id FROM {table} WHERE duplicate_of IS NULL')
+            index = self._fingerprint_index[table] = dict(cursor.fetchall())
+        return index
+
+    def _record_write(self, cursor: sqlite3.Cursor, table: str, changed_ids: list, deleted_ids: list,
+                      before_commit: Optional[BeforeCommit]) -> None:
+        """Count a write transaction on an entries table and run the caller's hook before it commits"""
+        cursor.execute('''
+            INSERT INTO ledger_meta (table_name, write_count) VALUES (?, 1)
+            ON CONFLICT(table_name) DO UPDATE SET write_count = write_count + 1
+        ''', (table,))
+        if before_commit is not None:
+            before_commit(cursor, table, changed_ids, deleted_ids)
+
+    def _bump_data_version(self, cursor: sqlite3.Cursor, table: str) -> None:
+        """Record a change to a table that is not a plain append"""
+        cursor.execute('''
+            INSERT INTO ledger_meta (table_name, data_version) VALUES (?, 1)
+            ON CONFLICT(table_name) DO UPDATE SET data_version = data_version + 1
+        ''', (table,))
 
     def get_all_income_entries(self) -> list:
         """Retrieve all income entries from the database"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._read_connection() as conn:
             cursor = conn.cursor()
             cursor.execute('SELECT * FROM income_entries ORDER BY date DESC')
             return cursor.fetchall()
 
     def get_all_expense_entries(self) -> list:
         """Retrieve all expense entries from the database"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._read_connection() as conn:
             cursor = conn.cursor()
             cursor.execute('SELECT * FROM expense_entries ORDER BY date DESC')
             return cursor.fetchall()
 
+    def iter_entry_chunks(self, table: str, chunk_size: int = 5000, after_id: int = 0) -> Iterator[list]:
+        """
+        Yield the rows of an entries table with an id above after_id in id order,
+        chunk_size rows at a time. Each chunk is a separate query, so the table
+        may be written between chunks.
+        """
+        party = ENTRY_TABLES[table]
+        last_id = after_id
+        while True:
+            with self._read_connection() as conn:
+                cursor = conn.cursor()
+                cursor.execute(f'''
+                    SELECT id, amount, {party}, date, category, description FROM {table}
+                    WHERE id > ? ORDER BY id LIMIT ?
+                ''', (last_id, chunk_size))
+                rows = cursor.fetchall()
+            if not rows:
+                return
+            yield rows
+            last_id = rows[-1][0]
+
+    def recategorize_entries(self, table: str, updates: list, before_commit: Optional[BeforeCommit] = None) -> int:
+        """Apply (category, id) updates to an entries table in one transaction"""
+        if not updates:
+            return 0
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.executemany(f'UPDATE {table} SET category = ? WHERE id = ?', updates)
+            self._bump_data_version(cursor, table)
+            self._record_write(cursor, table, [entry_id for _, entry_id in updates], [], before_commit)
+            conn.commit()
+            self._replicate_rows(conn, table, [entry_id for _, entry_id in updates])
+            self._replicate_rows(conn, 'ledger_meta', [table])
+            return len(updates)
+
+    def get_ledger_stamp(self, table: str) -> LedgerStamp:
+        """Row count, highest id and data version of an entries table"""
+        with self._read_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f'SELECT COUNT(*), COALESCE(MAX(id), 0) FROM {table}')
+            row_count, max_id = cursor.fetchone()
+            cursor.execute('SELECT data_version FROM ledger_meta WHERE table_name = ?', (table,))
+            version = cursor.fetchone()
+            return LedgerStamp(row_count, max_id, version[0] if version else 0)
+
+    def get_write_count(self, table: str) -> int:
+        """Number of write transactions committed to an entries table"""
+        with self._read_connection() as conn:
+            return self.read_write_count(conn.cursor(), table)
+
+    @staticmethod
+    def read_write_count(cursor: sqlite3.Cursor, table: str) -> int:
+        """Write count of an entries table as seen by cursor, e.g. inside a before_commit hook"""
+        cursor.execute('SELECT write_count FROM ledger_meta WHERE table_name = ?', (table,))
+        row = cursor.fetchone()
+        return row[0] if row else 0
+
+    def read_entries(self, cursor: sqlite3.Cursor, table: str, entry_ids: list) -> list:
+        """
+        (id, amount, party, date, category, description) rows of the given ids
+        with parsed dates, as seen by cursor, e.g. inside a before_commit hook
+        """
+        party = ENTRY_TABLES[table]
+        rows = []
+        for start in range(0, len(entry_ids), REPLICATION_CHUNK_SIZE):
+            chunk = entry_ids[start:start + REPLICATION_CHUNK_SIZE]
+            placeholders = ', '.join('?' * len(chunk))
+            cursor.execute(f'''
+                SELECT id, amount, {party}, date, category, description FROM {table}
+                WHERE id IN ({placeholders})
+            ''', chunk)
+            rows.extend(cursor.fetchall())
+        return self._parse_ledger_rows(rows)
+
+    def load_ledger(self, table: str) -> list:
+        """
+        Load an entries table as (id, amount, party, date, category, description)
+        rows with parsed dates. With ledger snapshots enabled the rows come from
+        the binary snapshot beside the database, which is refreshed with only the
+        appended rows when the table grew and fully rebuilt after any other change.
+        """
+        if not self.ledger_snapshot:
+            return self._parse_ledger_rows(self._get_entries(table))
+
+        stamp = self.get_ledger_stamp(table)
+        snapshot = LedgerSnapshot(self.db_path.with_name(f'{self.db_path.stem}.{table}.snap'))
+        cached = snapshot.load()
+        if cached is not None:
+            cached_stamp, rows = cached
+            if cached_stamp == stamp:
+                return rows
+            if cached_stamp.data_version == stamp.data_version and cached_stamp.max_id <= stamp.max_id:
+                new_rows = self._parse_ledger_rows(self._get_entries(table, after_id=cached_stamp.max_id))
+                if cached_stamp.row_count + len(new_rows) == stamp.row_count:
+                    # Appended rows can be backdated, so merge them in by date
+                    rows = list(heapq.merge(rows, new_rows, key=lambda row: (row[3], row[0]), reverse=True))
+                    snapshot.write(rows, stamp)
+                    return rows
+
+        rows = self._parse_ledger_rows(self._get_entries(table))
+        snapshot.write(rows, stamp)
+        return rows
+
+    def _get_entries(self, table: str, after_id: int = 0) -> list:
+        """Retrieve entries of a table with an id above after_id, newest first (ties by id)"""
+        party = ENTRY_TABLES[table]
+        with self._read_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute(f'''
+                SELECT id, amount, {party}, date, category, description FROM {table}
+                WHERE id > ? ORDER BY date DESC, id DESC
+            ''', (after_id,))
+            return cursor.fetchall()
+
+    @staticmethod
+    def _parse_ledger_rows(rows: list) -> list:
+        return [
+            (row[0], row[1], row[2], datetime.strptime(row[3], '%Y-%m-%d %H:%M:%S'), row[4], row[5])
+            for row in rows
+        ]
+
     def add_custom_income_category(self, name: str, description: str) -> bool:
         """Add a new custom income category"""
         try:
@@ -124,6 +729,7 @@ class DatabaseManager:
                     VALUES (?, ?)
                 ''', (name.upper(), description))
                 conn.commit()
+                self._replicate_rows(conn, 'custom_income_categories', [name.upper()])
                 return True
         except sqlite3.IntegrityError:
             return False
@@ -138,20 +744,122 @@ class DatabaseManager:
                     VALUES (?, ?)
                 ''', (name.upper(), description))
                 conn.commit()
+                self._replicate_rows(conn, 'custom_expense_categories', [name.upper()])
                 return True
         except sqlite3.IntegrityError:
             return False
 
     def get_custom_income_categories(self) -> dict:
         """Retrieve all custom income categories"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._read_connection() as conn:
             cursor = conn.cursor()
             cursor.execute('SELECT name, description FROM custom_income_categories')
             return dict(cursor.fetchall())
 
     def get_custom_expense_categories(self) -> dict:
         """Retrieve all custom expense categories"""
-        with sqlite3.connect(self.db_path) as conn:
+        with self._read_connection() as conn:
             cursor = conn.cursor()
             cursor.execute('SELECT name, description FROM custom_expense_categories')
-            return dict(cursor.fetchall())
\ No newline at end of file
+            return dict(cursor.fetchall())
+
+    def add_categorization_rule(self, rule: CategorizationRule) -> int:
+        """Add a new categorization rule"""
+        rule_data = rule.to_dict()
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                INSERT INTO categorization_rules (kind, rule_type, category, pattern, min_amount, max_amount, priority)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            ''', (
+                rule_data['kind'],
+                rule_data['rule_type'],
+                rule_data['category'],
+                rule_data['pattern'],
+                rule_data['min_amount'],
+                rule_data['max_amount'],
+                rule_data['priority']
+            ))
+            conn.commit()
+            self._replicate_rows(conn, 'categorization_rules', [cursor.lastrowid])
+            return cursor.lastrowid
+
+    def get_categorization_rules(self, kind: str) -> list:
+        """Retrieve the categorization rules for 'income' or 'expense' entries"""
+        with self._read_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT id, kind, rule_type, category, pattern, min_amount, max_amount, priority
+                FROM categorization_rules WHERE kind = ? ORDER BY id
+            ''', (kind,))
+            columns = [column[0] for column in cursor.description]
+            return [CategorizationRule.from_dict(dict(zip(columns, row))) for row in cursor.fetchall()]
+
+    def add_recurring_schedule(self, schedule_data: dict) -> int:
+        """Add a new recurring schedule"""
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                INSERT INTO recurring_schedules
+                    (kind, amount, party, category, cadence, start_date, end_date, description, last_materialized)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (
+                schedule_data['kind'],
+                schedule_data['amount'],
+                schedule_data['party'],
+                schedule_data['category'],
+                schedule_data['cadence'],
+                schedule_data['start_date'],
+                schedule_data['end_date'],
+                schedule_data['description'],
+                schedule_data['last_materialized']
+            ))
+            conn.commit()
+            self._replicate_rows(conn, 'recurring_schedules', [cursor.lastrowid])
+            return cursor.lastrowid
+
+    def get_recurring_schedules(self) -> list:
+        """Retrieve all recurring schedules"""
+        with self._read_connection() as conn:
+            cursor = conn.cursor()
+            cursor.execute('''
+                SELECT id, kind, amount, party, category, cadence, start_date, end_date, description, last_materialized
+                FROM recurring_schedules ORDER BY id
+            ''')
+            columns = [column[0] for column in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    def save_spend_sketches(self, updates: dict, write_count: Optional[int]) -> None:
+        """Store spend sketches in their own transaction, see write_spend_sketches"""
+        with sqlite3.connect(self.db_path) as conn:
+            self.write_spend_sketches(conn.cursor(), updates, write_count)
+            conn.commit()
+
+    @staticmethod
+    def write_spend_sketches(cursor: sqlite3.Cursor, updates: dict, write_count: Optional[int]) -> None:
+        """
+        Write serialized spend sketches by key, deleting keys mapped to None,
+        along with the expense ledger write count they reflect. Without a write
+        count the stored sketches are marked as out of date.
+        """
+        rows = [(key, data) for key, data in updates.items() if data is not None]
+        deleted = [key for key, data in updates.items() if data is None]
+        if write_count is not None:
+            rows.append((SKETCH_STAMP_KEY, json.dumps({'write_count': write_count})))
+        else:
+            deleted.append(SKETCH_STAMP_KEY)
+        cursor.executemany('INSERT OR REPLACE INTO spend_sketches (sketch_key, sketch) VALUES (?, ?)', rows)
+        cursor.executemany('DELETE FROM spend_sketches WHERE sketch_key = ?', [(key,) for key in deleted])
+
+    def load_spend_sketches(self) -> tuple:
+        """
+        Serialized spend sketches by key, and the expense ledger write count
+        they were stored with (None if out of date). Sketches are not kept in
+        the replica, so they are always read from disk.
+        """
+        with sqlite3.connect(self.db_path) as conn:
+            cursor = conn.cursor()
+            cursor.execute('SELECT sketch_key, sketch FROM spend_sketches')
+            sketches = dict(cursor.fetchall())
+        stamp = sketches.pop(SKETCH_STAMP_KEY, None)
+        return (json.loads(stamp)['write_count'] if stamp is not None else None), sketches
@@ -0,0 +1,56 @@
+# src/database/deduplication.py
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import List, Optional, Set
+import hashlib
+import re
+import unicodedata
+
+class DuplicatePolicy(Enum):
+    SKIP = "Drop incoming entries that match an existing entry"
+    FLAG = "Store incoming duplicates, marked with the id of the entry they match"
+    MERGE = "Update the matching entry with the incoming category and timestamp"
+
+@dataclass
+class ImportResult:
+    """Outcome of a batched insert"""
+    # Stored row id for every incoming entry, in input order: the new row for
+    # inserted and flagged entries, the existing row for merged ones and None
+    # for skipped or invalid ones
+    entry_ids: List[Optional[int]] = field(default_factory=list)
+    # Ids of existing rows that incoming entries were merged into
+    merged_ids: Set[int] = field(default_factory=set)
+    inserted: int = 0
+    duplicates_skipped: int = 0
+    duplicates_flagged: int = 0
+    duplicates_merged: int = 0
+    invalid: int = 0
+
+    @property
+    def duplicates(self) -> int:
+        return self.duplicates_skipped + self.duplicates_flagged + self.duplicates_merged
+
+# Bumped whenever fingerprint_entry changes; stored entries are re-fingerprinted on start
+FINGERPRINT_VERSION = 2
+
+_NON_WORD = re.compile(r'[\W_]+')
+
+def normalize_text(value: Optional[str]) -> str:
+    """
+    Casefold and strip punctuation and spacing so cosmetic differences don't
+    matter. Letters of every script are kept, so 'Магазин' and 'Аптека' stay distinct.
+    """
+    return _NON_WORD.sub('', unicodedata.normalize('NFKC', value or '').casefold())
+
+def fingerprint_entry(entry_data: dict, party_field: str) -> str:
+    """
+    Fingerprint an entry dictionary from its amount, normalized vendor/source,
+    calendar date and normalized description
+    """
+    key = '|'.join((
+        f"{float(entry_data['amount']):.2f}",
+        normalize_text(entry_data[party_field]),
+        entry_data['date'][:10],
+        normalize_text(entry_data.get('description')),
+    ))
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()
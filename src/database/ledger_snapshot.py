@@ -0,0 +1,154 @@
+# src/database/ledger_snapshot.py
+from array import array
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import List, Optional, Tuple
+import mmap
+import os
+import struct
+
+# File layout (little endian, every section 8-byte aligned):
+#   header   magic, format version, row count, max id, data version,
+#            string count, string bytes
+#   columns  id int64[n], amount float64[n], timestamp int64[n],
+#            category int32[n], party int32[n], description int32[n]
+#   strings  offsets uint64[string count + 1], utf-8 bytes
+# Text columns are dictionary encoded: each cell is an index into the string
+# table, or -1 for NULL.
+MAGIC = b'PBTSNAP1'
+FORMAT_VERSION = 1
+HEADER = struct.Struct('<8sI4xqqqQQ8x')
+
+EPOCH = datetime(1970, 1, 1)
+
+
+@dataclass
+class LedgerStamp:
+    """Identifies the state of an entries table a snapshot was taken from"""
+    row_count: int
+    max_id: int
+    data_version: int
+
+
+def _pad(size: int) -> int:
+    return (8 - size % 8) % 8
+
+
+class LedgerSnapshot:
+    """Fixed-width columnar snapshot of an entries table, read back through mmap"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+
+    def write(self, rows: List[tuple], stamp: LedgerStamp) -> None:
+        """
+        Write rows shaped (id, amount, party, date, category, description),
+        with date as a datetime, replacing any previous snapshot atomically
+        """
+        strings: List[str] = []
+        codes = {}
+
+        def encode(value: Optional[str]) -> int:
+            if value is None:
+                return -1
+            code = codes.get(value)
+            if code is None:
+                code = codes[value] = len(strings)
+                strings.append(value)
+            return code
+
+        ids = array('q', (row[0] for row in rows))
+        amounts = array('d', (row[1] for row in rows))
+        timestamps = array('q', (int((row[3] - EPOCH).total_seconds()) for row in rows))
+        categories = array('i', (encode(row[4]) for row in rows))
+        parties = array('i', (encode(row[2]) for row in rows))
+        descriptions = array('i', (encode(row[5]) for row in rows))
+
+        encoded = [value.encode('utf-8') for value in strings]
+        offsets = array('Q', [0])
+        for value in encoded:
+            offsets.append(offsets[-1] + len(value))
+        string_bytes = b''.join(encoded)
+
+        tmp_path = self.path.with_suffix(self.path.suffix + '.tmp')
+        with open(tmp_path, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, FORMAT_VERSION, len(rows), stamp.max_id,
+                                stamp.data_version, len(strings), len(string_bytes)))
+            for column in (ids, amounts, timestamps, categories, parties, descriptions):
+                f.write(column.tobytes())
+            f.write(b'\0' * _pad(3 * 4 * len(rows)))
+            f.write(offsets.tobytes())
+            f.write(string_bytes)
+        os.replace(tmp_path, self.path)
+
+    def load(self) -> Optional[Tuple[LedgerStamp, List[tuple]]]:
+        """
+        Map the snapshot and decode it into rows shaped like write() input.
+        Returns None when the file is missing, truncated or of another format.
+        """
+        if not self.path.exists():
+            return None
+        try:
+            with open(self.path, 'rb') as f:
+                if os.fstat(f.fileno()).st_size < HEADER.size:
+                    return None
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    return self._decode(mapped)
+        except (OSError, ValueError, struct.error):
+            return None
+
+    def _decode(self, mapped: mmap.mmap) -> Optional[Tuple[LedgerStamp, List[tuple]]]:
+        magic, version, n, max_id, data_version, string_count, string_size = HEADER.unpack_from(mapped)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            return None
+
+        offsets_start = HEADER.size + 3 * 8 * n + 3 * 4 * n + _pad(3 * 4 * n)
+        strings_start = offsets_start + 8 * (string_count + 1)
+        if len(mapped) != strings_start + string_size:
+            return None
+
+        view = memoryview(mapped)
+        try:
+            def column(index: int, fmt: str, width: int, base: int = HEADER.size):
+                start = base + index * width * n
+                return view[start:start + width * n].cast(fmt)
+
+            ids = column(0, 'q', 8)
+            amounts = column(1, 'd', 8)
+            timestamps = column(2, 'q', 8)
+            int_base = HEADER.size + 3 * 8 * n
+            categories = column(0, 'i', 4, int_base)
+            parties = column(1, 'i', 4, int_base)
+            descriptions = column(2, 'i', 4, int_base)
+            offsets = view[offsets_start:strings_start].cast('Q')
+
+            strings = [
+                str(mapped[strings_start + offsets[i]:strings_start + offsets[i + 1]], 'utf-8')
+                for i in range(string_count)
+            ]
+            # Entries are stamped to the second, so decoding each distinct
+            # timestamp once avoids rebuilding the same datetime repeatedly
+            dates = {}
+            rows = []
+            for i in range(n):
+                ts = timestamps[i]
+                date = dates.get(ts)
+                if date is None:
+                    date = dates[ts] = EPOCH + timedelta(seconds=ts)
+                party, description = parties[i], descriptions[i]
+                rows.append((
+                    ids[i],
+                    amounts[i],
+                    strings[party] if party >= 0 else None,
+                    date,
+                    strings[categories[i]],
+                    strings[description] if description >= 0 else None,
+                ))
+            # Release the exported buffers before the mmap is closed
+            for buffer in (ids, amounts, timestamps, categories, parties, descriptions, offsets):
+                buffer.release()
+        finally:
+            view.release()
+
+        return LedgerStamp(n, max_id, data_version), rows
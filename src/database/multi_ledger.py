@@ -0,0 +1,172 @@
+# src/database/multi_ledger.py
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+import sqlite3
+from src.settings import DATABASE
+from .database_manager import DatabaseManager, ENTRY_TABLES
+from .deduplication import DuplicatePolicy, ImportResult
+
+# Partial aggregates: (table, 'YYYY-MM', category) -> [total amount, entry count]
+Aggregates = Dict[Tuple[str, str, str], List[float]]
+
+def aggregate_ledger(path: str, start: Optional[str] = None, end: Optional[str] = None) -> Aggregates:
+    """
+    Sum the entries of one ledger file by table, month and category, optionally
+    limited to dates in [start, end). Module level so it can run in a worker process.
+    """
+    conditions = []
+    params = []
+    if start is not None:
+        conditions.append('date >= ?')
+        params.append(start)
+    if end is not None:
+        conditions.append('date < ?')
+        params.append(end)
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ''
+
+    aggregates = {}
+    with sqlite3.connect(Path(path).as_uri() + '?mode=ro', uri=True) as conn:
+        for table in ENTRY_TABLES:
+            cursor = conn.execute(f'''
+                SELECT substr(date, 1, 7), category, SUM(amount), COUNT(*)
+                FROM {table} {where}
+                GROUP BY 1, 2
+            ''', params)
+            for month, category, total, count in cursor:
+                aggregates[(table, month, category)] = [total, count]
+    return aggregates
+
+def merge_aggregates(partials: List[Aggregates]) -> Aggregates:
+    """Combine per-ledger aggregates into one"""
+    merged = {}
+    for partial in partials:
+        for key, (total, count) in partial.items():
+            current = merged.setdefault(key, [0, 0])
+            current[0] += total
+            current[1] += count
+    return merged
+
+class MultiLedgerManager:
+    """
+    Manages several ledger databases, either named ledgers (one file per
+    household member or business) or one file per year in a directory.
+    Inserts are routed to a single ledger; aggregates are computed across all
+    ledgers in parallel worker processes and merged.
+    """
+
+    def __init__(self, ledgers: Optional[Dict[str, str | Path]] = None,
+                 year_shard_dir: Optional[str | Path] = None, max_workers: Optional[int] = None):
+        if ledgers is None and year_shard_dir is None:
+            ledgers = DATABASE.get('ledgers')
+            year_shard_dir = DATABASE.get('year_shard_dir')
+        if not ledgers and year_shard_dir is None:
+            raise ValueError("Configure named ledgers or a directory for yearly ledgers")
+
+        self.ledger_paths: Dict[str, Path] = {name: Path(path).resolve() for name, path in (ledgers or {}).items()}
+        self.year_shard_dir = Path(year_shard_dir).resolve() if year_shard_dir is not None else None
+        if self.year_shard_dir is not None:
+            self.year_shard_dir.mkdir(parents=True, exist_ok=True)
+            for path in sorted(self.year_shard_dir.glob('budget_*.db')):
+                self.ledger_paths.setdefault(path.stem.split('_', 1)[1], path)
+        self.max_workers = max_workers
+        self._managers: Dict[str, DatabaseManager] = {}
+        # Worker processes for aggregate(). Inside a with block they are started
+        # on first use and kept until the block ends; otherwise each aggregate()
+        # stops them when done.
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._with_depth = 0
+
+    def close(self) -> None:
+        """Stop the aggregation worker processes"""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def __enter__(self) -> 'MultiLedgerManager':
+        self._with_depth += 1
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._with_depth -= 1
+        if not self._with_depth:
+            self.close()
+
+    def get_ledger(self, name: str) -> DatabaseManager:
+        """DatabaseManager of a ledger, opened on first use; yearly ledgers are created as needed"""
+        manager = self._managers.get(name)
+        if manager is None:
+            path = self.ledger_paths.get(name)
+            if path is None:
+                if self.year_shard_dir is None or not name.isdigit():
+                    raise ValueError(f"Unknown ledger '{name}'")
+                path = self.ledger_paths[name] = self.year_shard_dir / f"budget_{name}.db"
+            manager = self._managers[name] = DatabaseManager(path)
+        return manager
+
+    def route(self, entry_data: dict, ledger: Optional[str] = None) -> str:
+        """Name of the ledger an entry belongs to: the one given, or its year when sharding by year"""
+        if ledger is not None:
+            return ledger
+        if self.year_shard_dir is None:
+            raise ValueError("A ledger name is required unless ledgers are sharded by year")
+        return entry_data['date'][:4]
+
+    def add_income_entry(self, entry_data: dict, ledger: Optional[str] = None) -> int:
+        """Add a new income entry to its ledger"""
+        return self.get_ledger(self.route(entry_data, ledger)).add_income_entry(entry_data)
+
+    def add_expense_entry(self, entry_data: dict, ledger: Optional[str] = None) -> int:
+        """Add a new expense entry to its ledger"""
+        return self.get_ledger(self.route(entry_data, ledger)).add_expense_entry(entry_data)
+
+    def add_income_entries(self, entries: list, policy: DuplicatePolicy = DuplicatePolicy.SKIP,
+                           ledger: Optional[str] = None) -> Dict[str, ImportResult]:
+        """Add income entries in one transaction per ledger, returning the result per ledger"""
+        return {
+            name: self.get_ledger(name).add_income_entries(batch, policy)
+            for name, batch in self._group_by_ledger(entries, ledger).items()
+        }
+
+    def add_expense_entries(self, entries: list, policy: DuplicatePolicy = DuplicatePolicy.SKIP,
+                            ledger: Optional[str] = None) -> Dict[str, ImportResult]:
+        """Add expense entries in one transaction per ledger, returning the result per ledger"""
+        return {
+            name: self.get_ledger(name).add_expense_entries(batch, policy)
+            for name, batch in self._group_by_ledger(entries, ledger).items()
+        }
+
+    def _group_by_ledger(self, entries: list, ledger: Optional[str]) -> Dict[str, list]:
+        batches = {}
+        for entry_data in entries:
+            batches.setdefault(self.route(entry_data, ledger), []).append(entry_data)
+        return batches
+
+    def aggregate(self, start: Optional[datetime] = None, end: Optional[datetime] = None,
+                  ledgers: Optional[List[str]] = None) -> Aggregates:
+        """
+        Totals by table, month and category across all ledgers (or the named
+        ones) for dates in [start, end), computed per ledger in parallel
+        """
+        names = ledgers if ledgers is not None else sorted(self.ledger_paths)
+        # Yearly ledgers not created yet are empty rather than unknown
+        unknown = [name for name in names
+                   if name not in self.ledger_paths and (self.year_shard_dir is None or not name.isdigit())]
+        if unknown:
+            raise ValueError(f"Unknown ledgers {unknown}; known ledgers are {sorted(self.ledger_paths)}")
+        paths = [str(self.ledger_paths[name]) for name in names
+                 if name in self.ledger_paths and self.ledger_paths[name].exists()]
+        start_text = start.strftime('%Y-%m-%d %H:%M:%S') if start else None
+        end_text = end.strftime('%Y-%m-%d %H:%M:%S') if end else None
+
+        if len(paths) <= 1:
+            return merge_aggregates([aggregate_ledger(path, start_text, end_text) for path in paths])
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+        try:
+            partials = self._executor.map(aggregate_ledger, paths, [start_text] * len(paths), [end_text] * len(paths))
+            return merge_aggregates(list(partials))
+        finally:
+            if not self._with_depth:
+                self.close()
@@ -11,11 +11,33 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 
 # Database settings
 # The SQLite database will be created in a 'data' directory
+# Set 'memory_replica' to True to serve all read queries from an in-memory
+# copy of the database, so reports never contend with writers on disk.
+# Set 'ledger_snapshot' to True to cache the entries tables in binary
+# snapshot files beside the database for faster startup
 DATABASE = {
-    'path': BASE_DIR / 'data' / 'budget.db'
+    'path': BASE_DIR / 'data' / 'budget.db',
+    'memory_replica': False,
+    'ledger_snapshot': False,
+    # Optional multi-ledger setup: named ledgers, e.g.
+    # {'alice': BASE_DIR / 'data' / 'alice.db', 'shop': BASE_DIR / 'data' / 'shop.db'},
+    # and/or a directory holding one budget_<year>.db per year
+    'ledgers': {},
+    'year_shard_dir': None
 }
 
 # Application settings
 # Set DEBUG to False in production
 DEBUG = True
-VERSION = '1.0.0'
\ No newline at end of file
+VERSION = '1.0.0'
+
+# Statement import settings
+# Categories assigned to imported entries whose vendor/source name contains
+# the given text (case-insensitive); unmatched entries go to OTHERS
+IMPORT_VENDOR_RULES = {
+    'expense': {
+        'Delhaize': 'FOOD',
+        'Proximus': 'UTILITIES',
+    },
+    'income': {},
+}
\ No newline at end of file
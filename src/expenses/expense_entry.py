@@ -1,6 +1,7 @@
 # src/expenses/expense_entry.py
 from datetime import datetime
 from dataclasses import dataclass
+from typing import Optional
 
 @dataclass
 class ExpenseEntry:
@@ -10,6 +11,7 @@ class ExpenseEntry:
     date: datetime
     category: str
     description: str = ""
+    id: Optional[int] = None  # Database row id, set once the entry is stored
     
     def to_dict(self) -> dict:
         """Convert the expense entry to a dictionary"""
@@ -29,5 +31,6 @@ class ExpenseEntry:
             vendor=data['vendor'],
             date=datetime.strptime(data['date'], '%Y-%m-%d %H:%M:%S'),
             category=data['category'],
-            description=data.get('description', '')
+            description=data.get('description', ''),
+            id=data.get('id')
         )
\ No newline at end of file
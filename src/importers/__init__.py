@@ -0,0 +1,6 @@
+from .statement_importer import StatementImporter, StatementImportSummary
+from .statement_parsers import StatementParser, CSVStatementParser, OFXStatementParser, register_parser
+from .vendor_rules import VendorRules
+
+__all__ = ['StatementImporter', 'StatementImportSummary', 'StatementParser',
+           'CSVStatementParser', 'OFXStatementParser', 'register_parser', 'VendorRules']
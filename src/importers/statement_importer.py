@@ -0,0 +1,145 @@
+# src/importers/statement_importer.py
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+import time
+from ..database.deduplication import DuplicatePolicy, ImportResult
+from ..income import IncomeManager, IncomeEntry
+from ..expenses import ExpenseManager, ExpenseEntry
+from .statement_parsers import StatementParser, StatementRow, get_parser
+from .vendor_rules import VendorRules
+
+@dataclass
+class StageTiming:
+    """Rows handled and time spent in one stage of an import"""
+    name: str
+    rows: int
+    seconds: float
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.seconds if self.seconds > 0 else float(self.rows)
+
+@dataclass
+class StatementImportSummary:
+    """Outcome of importing a set of statement files"""
+    files: int = 0
+    rows: int = 0
+    income: ImportResult = field(default_factory=ImportResult)
+    expenses: ImportResult = field(default_factory=ImportResult)
+    stages: List[StageTiming] = field(default_factory=list)
+    # Error message for every file that could not be parsed
+    errors: Dict[str, str] = field(default_factory=dict)
+
+def _parse_statement(parser: StatementParser, path: Path) -> List[StatementRow]:
+    """Parse one file; module level so it can run in a worker process"""
+    return parser.parse(path)
+
+def _combine_results(total: ImportResult, batch: ImportResult) -> None:
+    total.entry_ids.extend(batch.entry_ids)
+    total.merged_ids.update(batch.merged_ids)
+    total.inserted += batch.inserted
+    total.duplicates_skipped += batch.duplicates_skipped
+    total.duplicates_flagged += batch.duplicates_flagged
+    total.duplicates_merged += batch.duplicates_merged
+    total.invalid += batch.invalid
+
+class StatementImporter:
+    """
+    Imports bank statement files: files are parsed concurrently in a process
+    pool, rows are classified as income (positive amounts) or expenses
+    (negative amounts) and categorized by the stored categorization rules,
+    then the vendor rules, then written by this process in batched transactions.
+    """
+
+    def __init__(self, income_manager: IncomeManager, expense_manager: ExpenseManager,
+                 vendor_rules: Optional[VendorRules] = None,
+                 parsers: Optional[Dict[str, StatementParser]] = None,
+                 max_workers: Optional[int] = None, batch_size: int = 5000):
+        self.income_manager = income_manager
+        self.expense_manager = expense_manager
+        self.vendor_rules = vendor_rules or VendorRules.from_settings()
+        self.parsers = parsers
+        self.max_workers = max_workers
+        self.batch_size = batch_size
+
+    def import_files(self, paths: Iterable[str | Path],
+                     policy: DuplicatePolicy = DuplicatePolicy.SKIP) -> StatementImportSummary:
+        """Import every statement file in paths, resolving duplicates according to policy"""
+        paths = [Path(path) for path in paths]
+        summary = StatementImportSummary(files=len(paths))
+
+        start = time.perf_counter()
+        rows = self._parse_files(paths, summary.errors)
+        summary.rows = len(rows)
+        summary.stages.append(StageTiming('parse', len(rows), time.perf_counter() - start))
+
+        start = time.perf_counter()
+        income_entries, expense_entries = self._classify(rows)
+        summary.stages.append(StageTiming('classify', len(rows), time.perf_counter() - start))
+
+        start = time.perf_counter()
+        for begin in range(0, len(income_entries), self.batch_size):
+            batch = income_entries[begin:begin + self.batch_size]
+            _combine_results(summary.income, self.income_manager.import_income(batch, policy))
+        for begin in range(0, len(expense_entries), self.batch_size):
+            batch = expense_entries[begin:begin + self.batch_size]
+            _combine_results(summary.expenses, self.expense_manager.import_expenses(batch, policy))
+        summary.stages.append(StageTiming('write', len(rows), time.perf_counter() - start))
+
+        return summary
+
+    def _parse_files(self, paths: List[Path], errors: Dict[str, str]) -> List[StatementRow]:
+        """Parse all files, in worker processes when there is more than one"""
+        jobs = []
+        for path in paths:
+            try:
+                jobs.append((get_parser(path, self.parsers), path))
+            except ValueError as e:
+                errors[str(path)] = str(e)
+
+        rows = []
+        if len(jobs) <= 1:
+            for parser, path in jobs:
+                try:
+                    rows.extend(_parse_statement(parser, path))
+                except Exception as e:
+                    errors[str(path)] = str(e)
+            return rows
+
+        with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = [(path, executor.submit(_parse_statement, parser, path)) for parser, path in jobs]
+            for path, future in futures:
+                try:
+                    rows.extend(future.result())
+                except Exception as e:
+                    errors[str(path)] = str(e)
+        return rows
+
+    def _classify(self, rows: List[StatementRow]) -> tuple:
+        """Split rows into income and expense entries with categories assigned"""
+        income_rules = self.income_manager.categorization_engine
+        expense_rules = self.expense_manager.categorization_engine
+        income_entries = []
+        expense_entries = []
+        for row in rows:
+            if row.amount > 0:
+                income_entries.append(IncomeEntry(
+                    amount=row.amount,
+                    source=row.payee,
+                    date=row.date,
+                    category=(income_rules.categorize(row.payee, row.description, row.amount) or
+                              self.vendor_rules.categorize('income', row.payee)),
+                    description=row.description
+                ))
+            elif row.amount < 0:
+                expense_entries.append(ExpenseEntry(
+                    amount=-row.amount,
+                    vendor=row.payee,
+                    date=row.date,
+                    category=(expense_rules.categorize(row.payee, row.description, -row.amount) or
+                              self.vendor_rules.categorize('expense', row.payee)),
+                    description=row.description
+                ))
+        return income_entries, expense_entries
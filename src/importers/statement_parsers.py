@@ -0,0 +1,193 @@
+# src/importers/statement_parsers.py
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+import csv
+import re
+
+@dataclass
+class StatementRow:
+    """A single transaction read from a bank statement. Negative amounts are money spent."""
+    amount: float
+    payee: str
+    date: datetime
+    description: str = ""
+
+# Digits split into groups of three by a separator, e.g. '1,500' or '1.234.567'
+_THOUSANDS_GROUPS = {
+    separator: re.compile(rf'[+-]?\d{{1,3}}(?:{re.escape(separator)}\d{{3}})+')
+    for separator in (',', '.')
+}
+
+def _detect_decimal_separator(text: str) -> str:
+    if ',' in text and '.' in text:
+        # Whichever separator comes last is the decimal point
+        return ',' if text.rfind(',') > text.rfind('.') else '.'
+    if ',' in text:
+        return '.' if _THOUSANDS_GROUPS[','].fullmatch(text) else ','
+    if text.count('.') > 1 and _THOUSANDS_GROUPS['.'].fullmatch(text):
+        return ','
+    return '.'
+
+def parse_amount(value: str, decimal_separator: Optional[str] = None) -> float:
+    """
+    Parse amounts such as '-1,234.50', '(12.00)' or '€ 1.234,50'. Without a
+    decimal_separator ('.' or ',') the last separator is the decimal point,
+    except a lone comma between groups of three digits ('1,500') and repeated
+    dots ('1.234.567'), which separate thousands.
+    """
+    text = value.strip().replace(' ', '').replace('\u00a0', '')
+    negative = text.startswith('(') and text.endswith(')')
+    text = re.sub(r'[^0-9,.\-+]', '', text)
+    if decimal_separator is None:
+        decimal_separator = _detect_decimal_separator(text)
+    thousands_separator = ',' if decimal_separator == '.' else '.'
+    text = text.replace(thousands_separator, '').replace(decimal_separator, '.')
+    amount = float(text)
+    return -abs(amount) if negative else amount
+
+class StatementParser(ABC):
+    """Base class for statement parsers; subclasses turn one file into StatementRows"""
+
+    @abstractmethod
+    def parse(self, path: Path) -> List[StatementRow]:
+        ...
+
+class CSVStatementParser(StatementParser):
+    """
+    Parser for CSV exports. columns maps the StatementRow fields (amount, payee,
+    date, description) to column headers; banks exporting separate debit and
+    credit columns can map 'debit' and 'credit' instead of 'amount'.
+
+    Dates are read with the first of date_formats that fits every date in the
+    file, so a file is never read partly day-first and partly month-first;
+    day_first picks the preferred order for the default formats. Amounts are
+    read with decimal_separator when given, otherwise it is detected per value.
+    """
+
+    DEFAULT_COLUMNS = {
+        'date': 'Date',
+        'amount': 'Amount',
+        'payee': 'Payee',
+        'description': 'Description',
+    }
+    DAY_FIRST_DATE_FORMATS = ('%Y-%m-%d', '%Y-%m-%d %H:%M:%S', '%d/%m/%Y', '%d.%m.%Y', '%m/%d/%Y')
+    MONTH_FIRST_DATE_FORMATS = ('%Y-%m-%d', '%Y-%m-%d %H:%M:%S', '%m/%d/%Y', '%d/%m/%Y', '%d.%m.%Y')
+
+    def __init__(self, columns: Optional[Dict[str, str]] = None, date_formats: Optional[tuple] = None,
+                 delimiter: str = ',', encoding: str = 'utf-8-sig', day_first: bool = True,
+                 decimal_separator: Optional[str] = None):
+        if decimal_separator not in (None, '.', ','):
+            raise ValueError(f"Unsupported decimal separator '{decimal_separator}'")
+        self.columns = columns or self.DEFAULT_COLUMNS
+        self.date_formats = date_formats or (
+            self.DAY_FIRST_DATE_FORMATS if day_first else self.MONTH_FIRST_DATE_FORMATS
+        )
+        self.delimiter = delimiter
+        self.encoding = encoding
+        self.decimal_separator = decimal_separator
+
+    def parse(self, path: Path) -> List[StatementRow]:
+        records = []
+        with open(path, newline='', encoding=self.encoding) as csvfile:
+            for record in csv.DictReader(csvfile, delimiter=self.delimiter):
+                amount = self._parse_record_amount(record)
+                if amount is not None:
+                    records.append((amount, record))
+
+        date_values = [record[self.columns['date']].strip() for _, record in records]
+        date_format = self._choose_date_format(date_values)
+        return [
+            StatementRow(
+                amount=amount,
+                payee=(record.get(self.columns['payee']) or '').strip(),
+                date=self._parse_date(date_value, date_format),
+                description=(record.get(self.columns.get('description', '')) or '').strip()
+            )
+            for (amount, record), date_value in zip(records, date_values)
+        ]
+
+    def _parse_record_amount(self, record: dict) -> Optional[float]:
+        if 'amount' in self.columns:
+            value = record.get(self.columns['amount']) or ''
+            return parse_amount(value, self.decimal_separator) if value.strip() else None
+        debit = (record.get(self.columns['debit']) or '').strip()
+        credit = (record.get(self.columns['credit']) or '').strip()
+        if debit:
+            return -abs(parse_amount(debit, self.decimal_separator))
+        if credit:
+            return abs(parse_amount(credit, self.decimal_separator))
+        return None
+
+    def _choose_date_format(self, values: List[str]) -> Optional[str]:
+        """The first date format every value parses with, or None when the file mixes formats"""
+        for date_format in self.date_formats:
+            try:
+                for value in values:
+                    datetime.strptime(value, date_format)
+            except ValueError:
+                continue
+            return date_format
+        return None
+
+    def _parse_date(self, value: str, date_format: Optional[str] = None) -> datetime:
+        if date_format is not None:
+            return datetime.strptime(value, date_format)
+        for date_format in self.date_formats:
+            try:
+                return datetime.strptime(value, date_format)
+            except ValueError:
+                continue
+        raise ValueError(f"Unrecognized date '{value}'")
+
+class OFXStatementParser(StatementParser):
+    """Parser for OFX/QFX statements, covering both the SGML (1.x) and XML (2.x) dialects"""
+
+    _TRANSACTION = re.compile(r'<STMTTRN>(.*?)(?:</STMTTRN>|(?=<STMTTRN>)|(?=</BANKTRANLIST>))', re.S | re.I)
+    _FIELD = re.compile(r'<(\w+)>([^<\r\n]*)')
+
+    def parse(self, path: Path) -> List[StatementRow]:
+        with open(path, encoding='utf-8', errors='replace') as f:
+            content = f.read()
+
+        rows = []
+        for block in self._TRANSACTION.findall(content):
+            fields = {name.upper(): value.strip() for name, value in self._FIELD.findall(block)}
+            if 'TRNAMT' not in fields or 'DTPOSTED' not in fields:
+                continue
+            rows.append(StatementRow(
+                amount=parse_amount(fields['TRNAMT']),
+                payee=fields.get('NAME') or fields.get('PAYEE') or '',
+                date=self._parse_date(fields['DTPOSTED']),
+                description=fields.get('MEMO', '')
+            ))
+        return rows
+
+    @staticmethod
+    def _parse_date(value: str) -> datetime:
+        # OFX dates look like 20240131, 20240131120000 or 20240131120000.000[-5:EST]
+        digits = re.match(r'\d+', value).group()
+        if len(digits) >= 14:
+            return datetime.strptime(digits[:14], '%Y%m%d%H%M%S')
+        return datetime.strptime(digits[:8], '%Y%m%d')
+
+# Parsers by file suffix; register_parser adds bank-specific formats
+PARSERS: Dict[str, StatementParser] = {
+    '.csv': CSVStatementParser(),
+    '.ofx': OFXStatementParser(),
+    '.qfx': OFXStatementParser(),
+}
+
+def register_parser(suffix: str, parser: StatementParser) -> None:
+    """Use parser for statement files ending in suffix (e.g. '.csv')"""
+    PARSERS[suffix.lower()] = parser
+
+def get_parser(path: Path, parsers: Optional[Dict[str, StatementParser]] = None) -> StatementParser:
+    """Find the parser registered for a statement file"""
+    parsers = PARSERS if parsers is None else parsers
+    parser = parsers.get(Path(path).suffix.lower())
+    if parser is None:
+        raise ValueError(f"No statement parser registered for '{Path(path).suffix}' files")
+    return parser
@@ -0,0 +1,31 @@
+# src/importers/vendor_rules.py
+from typing import Dict, Optional
+
+class VendorRules:
+    """Assign categories to imported entries by matching text in the vendor/source name"""
+
+    def __init__(self, expense_rules: Optional[Dict[str, str]] = None,
+                 income_rules: Optional[Dict[str, str]] = None,
+                 default_category: str = 'OTHERS'):
+        # Rules map a case-insensitive vendor/source fragment to a category,
+        # the first matching fragment wins
+        self.rules = {
+            'expense': {pattern.lower(): category.upper() for pattern, category in (expense_rules or {}).items()},
+            'income': {pattern.lower(): category.upper() for pattern, category in (income_rules or {}).items()},
+        }
+        self.default_category = default_category
+
+    @classmethod
+    def from_settings(cls) -> 'VendorRules':
+        """Build rules from IMPORT_VENDOR_RULES in settings, if defined"""
+        from src import settings
+        rules = getattr(settings, 'IMPORT_VENDOR_RULES', {})
+        return cls(rules.get('expense'), rules.get('income'))
+
+    def categorize(self, kind: str, payee: str) -> str:
+        """Category for an 'income' or 'expense' entry from the given payee"""
+        payee = payee.lower()
+        for pattern, category in self.rules[kind].items():
+            if pattern in payee:
+                return category
+        return self.default_category
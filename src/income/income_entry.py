@@ -1,5 +1,6 @@
 from datetime import datetime
 from dataclasses import dataclass
+from typing import Optional
 
 @dataclass
 class IncomeEntry:
@@ -9,6 +10,7 @@ class IncomeEntry:
     date: datetime
     category: str
     description: str = ""
+    id: Optional[int] = None  # Database row id, set once the entry is stored
     
     def to_dict(self) -> dict:
         """Convert the income entry to a dictionary"""
@@ -28,5 +30,6 @@ class IncomeEntry:
             source=data['source'],
             date=datetime.strptime(data['date'], '%Y-%m-%d %H:%M:%S'),
             category=data['category'],
-            description=data.get('description', '')
+            description=data.get('description', ''),
+            id=data.get('id')
         )
\ No newline at end of file
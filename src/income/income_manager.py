@@ -1,34 +1,57 @@
 # src/income/income_manager.py
+from dataclasses import replace
 from datetime import datetime
 from typing import List, Optional, Dict
 from .income_entry import IncomeEntry
 from .income_categories import IncomeCategoryManager
+from ..categorization import CategorizationEngine, CategorizationRule
+from ..database.deduplication import DuplicatePolicy, ImportResult
 
 class IncomeManager:
     def __init__(self, db_connection):
         self.db_connection = db_connection
         self.category_manager = IncomeCategoryManager()
         self.income_entries = []
+        # Entry id -> position in income_entries
+        self._entry_positions: Dict[int, int] = {}
         
         # Load custom categories from database
         custom_categories = self.db_connection.get_custom_income_categories()
         for name, description in custom_categories.items():
             self.category_manager._custom_categories[name] = description
+        self.categorization_engine = CategorizationEngine.from_database(self.db_connection, 'income')
         self._load_entries_from_db()
 
     def _load_entries_from_db(self):
-        db_entries = self.db_connection.get_all_income_entries()
+        db_entries = self.db_connection.load_ledger('income_entries')
         for entry in db_entries:
-            self.income_entries.append(IncomeEntry(
+            self._append_entry(IncomeEntry(
                 amount=entry[1],
                 source=entry[2],
-                date=datetime.strptime(entry[3], '%Y-%m-%d %H:%M:%S'),
+                date=entry[3],
                 category=entry[4],
-                description=entry[5]
+                description=entry[5],
+                id=entry[0]
             ))
 
+    def _append_entry(self, entry: IncomeEntry) -> None:
+        self._entry_positions[entry.id] = len(self.income_entries)
+        self.income_entries.append(entry)
+
+    def _remove_entries(self, entry_ids: List[int]) -> None:
+        # Keep the remaining entries in their order and reindex them once per batch
+        removed = set(entry_ids)
+        if not removed:
+            return
+        self.income_entries[:] = [entry for entry in self.income_entries if entry.id not in removed]
+        self._entry_positions = {entry.id: position for position, entry in enumerate(self.income_entries)}
+
     def add_income(self, amount: float, source: str, category: str, 
                   description: str = "", date: Optional[datetime] = None) -> Optional[IncomeEntry]:
+        if not category:
+            # No category given: use the categorization rules, falling back to OTHERS
+            category = self.categorization_engine.categorize(source, description, amount) or 'OTHERS'
+
         if not self.category_manager.is_valid_category(category):
             print(f"Error: Invalid category '{category}'. Valid categories are: {self.get_available_categories()}")
             return None
@@ -38,10 +61,138 @@ class IncomeManager:
             
         entry = IncomeEntry(amount, source, date, category.upper(), description)
         entry_data = entry.to_dict()
-        self.db_connection.add_income_entry(entry_data)
-        self.income_entries.append(entry)
+        entry.id = self.db_connection.add_income_entry(entry_data)
+        self._append_entry(entry)
         return entry
 
+    def import_income(self, entries: List[IncomeEntry],
+                      policy: DuplicatePolicy = DuplicatePolicy.SKIP) -> ImportResult:
+        """
+        Store a batch of entries in one transaction, resolving entries that match
+        existing ones according to policy. Entries without a category are
+        categorized by the rules; entries with an invalid category are not
+        stored and are counted as invalid.
+        """
+        prepared = self.prepare_import(entries)
+        result = self.db_connection.add_income_entries([entry.to_dict() for entry in prepared if entry is not None], policy)
+        return self.record_import(prepared, result)
+
+    def prepare_import(self, entries: List[IncomeEntry]) -> List[Optional[IncomeEntry]]:
+        """
+        Categorized copies of the entries, the caller's entries left untouched,
+        with None in place of entries whose category is invalid
+        """
+        prepared = []
+        for entry in entries:
+            category = entry.category or self.categorization_engine.categorize(
+                entry.source, entry.description, entry.amount
+            ) or 'OTHERS'
+            if self.category_manager.is_valid_category(category):
+                prepared.append(replace(entry, category=category.upper()))
+            else:
+                prepared.append(None)
+        return prepared
+
+    def record_import(self, prepared: List[Optional[IncomeEntry]], result: ImportResult) -> ImportResult:
+        """Apply the stored outcome of prepared entries to the loaded entries"""
+        valid_entries = [entry for entry in prepared if entry is not None]
+        result.invalid = len(prepared) - len(valid_entries)
+
+        for entry, entry_id in zip(valid_entries, result.entry_ids):
+            if entry_id is None:
+                continue
+            if entry_id in result.merged_ids and entry_id in self._entry_positions:
+                # Merged entries updated a stored row; apply the change to the loaded copy
+                existing = self.get_entry(entry_id)
+                existing.date = entry.date
+                existing.category = entry.category
+                continue
+            entry.id = entry_id
+            self._append_entry(entry)
+
+        # Report ids against the caller's list, invalid entries included
+        stored_ids = iter(result.entry_ids)
+        result.entry_ids = [None if entry is None else next(stored_ids) for entry in prepared]
+        return result
+
+    def add_categorization_rule(self, rule: CategorizationRule) -> Optional[CategorizationRule]:
+        error = CategorizationEngine.validate_rule(rule)
+        if error is None and not self.category_manager.is_valid_category(rule.category):
+            error = f"Invalid category '{rule.category}'. Valid categories are: {self.get_available_categories()}"
+        if error:
+            print(f"Error: {error}")
+            return None
+
+        rule.kind = 'income'
+        rule.category = rule.category.upper()
+        rule.id = self.db_connection.add_categorization_rule(rule)
+        self.categorization_engine = CategorizationEngine(self.categorization_engine.rules + [rule])
+        return rule
+
+    def recategorize_history(self, batch_size: int = 5000) -> int:
+        """
+        Apply the categorization rules to every stored entry, rewriting changed
+        categories one transaction per batch. Entries no rule matches keep their
+        category. Returns the number of entries changed.
+        """
+        changed = 0
+        for rows in self.db_connection.iter_entry_chunks('income_entries', batch_size):
+            updates = []
+            for entry_id, amount, source, _, category, description in rows:
+                new_category = self.categorization_engine.categorize(source, description, amount)
+                if new_category and new_category != category:
+                    updates.append((new_category, entry_id))
+            changed += self.db_connection.recategorize_entries('income_entries', updates)
+            for new_category, entry_id in updates:
+                if entry_id in self._entry_positions:
+                    self.get_entry(entry_id).category = new_category
+        return changed
+
+    def get_entry(self, entry_id: int) -> Optional[IncomeEntry]:
+        position = self._entry_positions.get(entry_id)
+        return None if position is None else self.income_entries[position]
+
+    def update_entry(self, entry_id: int, **changes) -> Optional[IncomeEntry]:
+        """Change fields (amount, source, date, category, description) of a stored entry"""
+        updated = self.update_entries({entry_id: changes})
+        return updated[0] if updated else None
+
+    def update_entries(self, updates: Dict[int, dict]) -> List[IncomeEntry]:
+        """
+        Apply field changes to several entries, keyed by entry id, in one
+        transaction. Nothing is changed if any id or category is invalid.
+        """
+        updated = []
+        for entry_id, changes in updates.items():
+            entry = self.get_entry(entry_id)
+            if entry is None:
+                print(f"Error: No income entry with id {entry_id}")
+                return []
+            unknown = set(changes) - {'amount', 'source', 'date', 'category', 'description'}
+            if unknown:
+                print(f"Error: Cannot update fields {sorted(unknown)}")
+                return []
+            category = changes.get('category', entry.category)
+            if not self.category_manager.is_valid_category(category):
+                print(f"Error: Invalid category '{category}'. Valid categories are: {self.get_available_categories()}")
+                return []
+            updated.append(replace(entry, **{**changes, 'category': category.upper()}))
+
+        self.db_connection.update_income_entries({entry.id: entry.to_dict() for entry in updated})
+        for entry in updated:
+            self.income_entries[self._entry_positions[entry.id]] = entry
+        return updated
+
+    def delete_entry(self, entry_id: int) -> bool:
+        return self.delete_entries([entry_id]) == 1
+
+    def delete_entries(self, entry_ids: List[int]) -> int:
+        """Delete entries by id in one transaction, returning how many were deleted"""
+        entry_ids = [entry_id for entry_id in set(entry_ids) if entry_id in self._entry_positions]
+        self.db_connection.delete_income_entries(entry_ids)
+        self._remove_entries(entry_ids)
+        return len(entry_ids)
+
     def get_available_categories(self) -> Dict[str, str]:
         return self.category_manager.get_all_categories()
 
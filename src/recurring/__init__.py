@@ -0,0 +1,4 @@
+from .recurring_manager import RecurringManager
+from .recurring_schedule import RecurringSchedule, Cadence
+
+__all__ = ['RecurringManager', 'RecurringSchedule', 'Cadence']
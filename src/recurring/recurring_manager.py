@@ -0,0 +1,90 @@
+# src/recurring/recurring_manager.py
+from datetime import datetime
+from typing import Iterator, List, Optional, Tuple
+from ..database.deduplication import ImportResult
+from ..income import IncomeManager, IncomeEntry
+from ..expenses import ExpenseManager, ExpenseEntry
+from .recurring_schedule import RecurringSchedule
+
+class RecurringManager:
+    """
+    Keeps recurring income and expense schedules. Due occurrences are
+    materialized into the ledger in bulk; future ones are available as
+    virtual entries that are never stored.
+    """
+
+    def __init__(self, db_connection, income_manager: IncomeManager, expense_manager: ExpenseManager):
+        self.db_connection = db_connection
+        self.income_manager = income_manager
+        self.expense_manager = expense_manager
+        self.schedules: List[RecurringSchedule] = [
+            RecurringSchedule.from_dict(data) for data in self.db_connection.get_recurring_schedules()
+        ]
+
+    def add_schedule(self, schedule: RecurringSchedule) -> Optional[RecurringSchedule]:
+        manager = self.income_manager if schedule.kind == 'income' else self.expense_manager
+        if not manager.category_manager.is_valid_category(schedule.category):
+            print(f"Error: Invalid category '{schedule.category}'. "
+                  f"Valid categories are: {manager.get_available_categories()}")
+            return None
+        if schedule.end_date is not None and schedule.end_date < schedule.start_date:
+            print("Error: End date is before start date")
+            return None
+
+        schedule.category = schedule.category.upper()
+        schedule.id = self.db_connection.add_recurring_schedule(schedule.to_dict())
+        self.schedules.append(schedule)
+        return schedule
+
+    def materialize(self, until: Optional[datetime] = None) -> Tuple[ImportResult, ImportResult]:
+        """
+        Write every occurrence due up to until (default now) that was not
+        materialized yet, in a single transaction. Returns the ImportResult of
+        the income and expense entries.
+        """
+        if until is None:
+            until = datetime.now()
+
+        generated = {'income': [], 'expense': []}
+        marks = []
+        for schedule in self.schedules:
+            dates = list(schedule.iter_occurrences(schedule.last_materialized, until))
+            if not dates:
+                continue
+            generated[schedule.kind].extend(self._make_entry(schedule, date) for date in dates)
+            marks.append((schedule, dates[-1]))
+        if not marks:
+            # Nothing due: skip the fingerprint lookups and the write transaction
+            return ImportResult(), ImportResult()
+
+        income = self.income_manager.prepare_import(generated['income'])
+        expenses = self.expense_manager.prepare_import(generated['expense'])
+        income_result, expense_result = self.db_connection.materialize_recurring_entries(
+            [entry.to_dict() for entry in income if entry is not None],
+            [entry.to_dict() for entry in expenses if entry is not None],
+            [(date.strftime('%Y-%m-%d %H:%M:%S'), schedule.id) for schedule, date in marks],
+            self.expense_manager.statistics.record_write
+        )
+        for schedule, date in marks:
+            schedule.last_materialized = date
+
+        return (self.income_manager.record_import(income, income_result),
+                self.expense_manager.record_import(expenses, expense_result))
+
+    def iter_virtual_entries(self, kind: str, start: datetime, end: datetime) -> Iterator:
+        """
+        Lazily yield unsaved entries for the occurrences of 'income' or 'expense'
+        schedules dated within [start, end) that are not materialized yet
+        """
+        for schedule in self.schedules:
+            if schedule.kind != kind:
+                continue
+            for date in schedule.iter_occurrences(schedule.last_materialized, end, inclusive=False):
+                if date >= start:
+                    yield self._make_entry(schedule, date)
+
+    @staticmethod
+    def _make_entry(schedule: RecurringSchedule, date: datetime):
+        if schedule.kind == 'income':
+            return IncomeEntry(schedule.amount, schedule.party, date, schedule.category, schedule.description)
+        return ExpenseEntry(schedule.amount, schedule.party, date, schedule.category, schedule.description)
@@ -0,0 +1,93 @@
+# src/recurring/recurring_schedule.py
+from calendar import monthrange
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from enum import Enum
+from typing import Iterator, Optional
+
+class Cadence(Enum):
+    WEEKLY = "Every week"
+    MONTHLY = "Every month"
+    QUARTERLY = "Every three months"
+    YEARLY = "Every year"
+
+# Months between occurrences for month-based cadences
+_CADENCE_MONTHS = {Cadence.MONTHLY: 1, Cadence.QUARTERLY: 3, Cadence.YEARLY: 12}
+
+def _add_months(date: datetime, months: int) -> datetime:
+    """Shift a date by whole months, clamping the day to the length of the target month"""
+    month_index = date.month - 1 + months
+    year = date.year + month_index // 12
+    month = month_index % 12 + 1
+    return date.replace(year=year, month=month, day=min(date.day, monthrange(year, month)[1]))
+
+@dataclass
+class RecurringSchedule:
+    """A rule for an income or expense that repeats on a fixed cadence"""
+    kind: str                  # 'income' or 'expense'
+    amount: float
+    party: str                 # Source for income, vendor for expenses
+    category: str
+    cadence: Cadence
+    start_date: datetime
+    end_date: Optional[datetime] = None
+    description: str = ""
+    last_materialized: Optional[datetime] = None  # Date of the last occurrence written to the ledger
+    id: Optional[int] = None
+
+    def occurrence(self, index: int) -> datetime:
+        """Date of the index-th occurrence, counting from the start date"""
+        if self.cadence is Cadence.WEEKLY:
+            return self.start_date + timedelta(weeks=index)
+        return _add_months(self.start_date, index * _CADENCE_MONTHS[self.cadence])
+
+    def iter_occurrences(self, after: Optional[datetime], until: datetime,
+                         inclusive: bool = True) -> Iterator[datetime]:
+        """
+        Yield occurrence dates later than after and up to until (excluded when
+        inclusive is False), lazily and in order
+        """
+        index = 0
+        while True:
+            date = self.occurrence(index)
+            if date > until or (not inclusive and date == until):
+                return
+            if self.end_date is not None and date > self.end_date:
+                return
+            if after is None or date > after:
+                yield date
+            index += 1
+
+    def to_dict(self) -> dict:
+        """Convert the schedule to a dictionary"""
+        return {
+            'kind': self.kind,
+            'amount': self.amount,
+            'party': self.party,
+            'category': self.category,
+            'cadence': self.cadence.name,
+            'start_date': self.start_date.strftime('%Y-%m-%d %H:%M:%S'),
+            'end_date': self.end_date.strftime('%Y-%m-%d %H:%M:%S') if self.end_date else None,
+            'description': self.description,
+            'last_materialized': (self.last_materialized.strftime('%Y-%m-%d %H:%M:%S')
+                                  if self.last_materialized else None)
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'RecurringSchedule':
+        """Create a RecurringSchedule instance from a dictionary"""
+        def parse(value: Optional[str]) -> Optional[datetime]:
+            return datetime.strptime(value, '%Y-%m-%d %H:%M:%S') if value else None
+
+        return cls(
+            kind=data['kind'],
+            amount=float(data['amount']),
+            party=data['party'],
+            category=data['category'],
+            cadence=Cadence[data['cadence']],
+            start_date=parse(data['start_date']),
+            end_date=parse(data.get('end_date')),
+            description=data.get('description') or '',
+            last_materialized=parse(data.get('last_materialized')),
+            id=data.get('id')
+        )
@@ -0,0 +1,4 @@
+from .quantile_sketch import QuantileSketch
+from .spend_statistics import SpendStatistics
+
+__all__ = ['QuantileSketch', 'SpendStatistics']
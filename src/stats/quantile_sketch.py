@@ -0,0 +1,105 @@
+# src/stats/quantile_sketch.py
+from typing import Dict, Optional
+import math
+
+class QuantileSketch:
+    """
+    Mergeable quantile sketch in the style of DDSketch. Values are counted in
+    buckets whose bounds grow geometrically, so every quantile is answered
+    within relative_accuracy of a true value and the number of buckets grows
+    with the log of the value range rather than with the number of values.
+    Unlike t-digest or KLL, values can be removed again exactly, which keeps
+    sketches correct when entries are edited or deleted.
+    """
+
+    def __init__(self, relative_accuracy: float = 0.01):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        # Bucket index -> number of values; index k covers (gamma^(k-1), gamma^k]
+        self.buckets: Dict[int, int] = {}
+        # Values of zero or less, which have no logarithm
+        self.zero_count = 0
+        self.count = 0
+        self.total = 0.0
+
+    def _bucket(self, value: float) -> Optional[int]:
+        return math.ceil(math.log(value) / self._log_gamma) if value > 0 else None
+
+    def add(self, value: float, count: int = 1) -> None:
+        bucket = self._bucket(value)
+        if bucket is None:
+            self.zero_count += count
+        else:
+            self.buckets[bucket] = self.buckets.get(bucket, 0) + count
+        self.count += count
+        self.total += value * count
+
+    def remove(self, value: float, count: int = 1) -> None:
+        """Remove a value previously added"""
+        bucket = self._bucket(value)
+        if bucket is None:
+            if self.zero_count < count:
+                raise ValueError(f"Value {value} is not in the sketch")
+            self.zero_count -= count
+        else:
+            remaining = self.buckets.get(bucket, 0) - count
+            if remaining < 0:
+                raise ValueError(f"Value {value} is not in the sketch")
+            if remaining:
+                self.buckets[bucket] = remaining
+            else:
+                del self.buckets[bucket]
+        self.count -= count
+        self.total -= value * count
+        if not self.count:
+            self.total = 0.0
+
+    def merge(self, other: 'QuantileSketch') -> None:
+        """Add all values of another sketch with the same relative accuracy"""
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Only sketches with the same relative accuracy can be merged")
+        for bucket, count in other.buckets.items():
+            self.buckets[bucket] = self.buckets.get(bucket, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        self.total += other.total
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Approximate q-quantile (0 <= q <= 1), or None for an empty sketch"""
+        if not self.count:
+            return None
+        if not 0 <= q <= 1:
+            raise ValueError(f"Quantile {q} is outside [0, 1]")
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if seen > rank:
+            return 0.0
+        for bucket in sorted(self.buckets):
+            seen += self.buckets[bucket]
+            if seen > rank:
+                # Midpoint of the bucket in relative terms
+                return 2 * self.gamma ** bucket / (self.gamma + 1)
+        return 2 * self.gamma ** max(self.buckets) / (self.gamma + 1)
+
+    def to_dict(self) -> dict:
+        return {
+            'relative_accuracy': self.relative_accuracy,
+            'buckets': [[bucket, count] for bucket, count in sorted(self.buckets.items())],
+            'zero_count': self.zero_count,
+            'count': self.count,
+            'total': self.total
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> 'QuantileSketch':
+        sketch = cls(data['relative_accuracy'])
+        sketch.buckets = {bucket: count for bucket, count in data['buckets']}
+        sketch.zero_count = data['zero_count']
+        sketch.count = data['count']
+        sketch.total = data['total']
+        return sketch
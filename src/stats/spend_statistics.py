@@ -0,0 +1,232 @@
+# src/stats/spend_statistics.py
+from collections import namedtuple
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+import json
+from .quantile_sketch import QuantileSketch
+
+# Charges above the third quartile plus this many interquartile ranges of their
+# category are unusual (Tukey's "far out" fence). The fence is taken on log
+# amounts, since spending is strongly right-skewed.
+OUTLIER_FENCE = 3.0
+# Categories with fewer entries than this never flag outliers
+MIN_OUTLIER_COUNT = 20
+
+# Sketch key: (scope, month 'YYYY-MM' or '' for all time, name)
+SketchKey = Tuple[str, str, str]
+
+# Stored rows as seen inside a write transaction, see SpendStatistics.record_write
+_StoredEntry = namedtuple('_StoredEntry', ['amount', 'vendor', 'date', 'category'])
+
+class SpendStatistics:
+    """
+    Quantile sketches of expense amounts per category, per vendor, per
+    category and month and per month, kept up to date entry by entry and
+    persisted in the database. Quantile queries read a single sketch instead of
+    sorting the entries.
+    """
+
+    def __init__(self, db_connection, entry_lookup: Callable[[int], Optional[object]],
+                 relative_accuracy: float = 0.01):
+        self.db_connection = db_connection
+        # Entry id -> loaded entry, still holding its values from before a write
+        self.entry_lookup = entry_lookup
+        self.relative_accuracy = relative_accuracy
+        self.sketches: Dict[SketchKey, QuantileSketch] = {}
+        # Keys changed since the last write, and keys present in the database
+        self._dirty = set()
+        self._stored = set()
+        # Expense ledger write count the sketches reflect. None once the ledger
+        # was changed by another writer; the sketches are then stored without a
+        # write count so the next load rebuilds them.
+        self._write_count: Optional[int] = None
+
+    @staticmethod
+    def _keys(entry) -> Tuple[SketchKey, ...]:
+        month = entry.date.strftime('%Y-%m')
+        return (
+            ('category', '', entry.category),
+            ('category', month, entry.category),
+            ('vendor', '', entry.vendor.strip()),
+            ('month', month, ''),
+        )
+
+    @staticmethod
+    def _encode_key(key: SketchKey) -> str:
+        return '|'.join(key)
+
+    @staticmethod
+    def _decode_key(value: str) -> SketchKey:
+        # The name comes last so it may contain the separator itself
+        return tuple(value.split('|', 2))
+
+    def load(self, entries: Iterable) -> None:
+        """
+        Load the stored sketches when they match the current expense ledger,
+        otherwise rebuild them from entries and store them
+        """
+        write_count, stored = self.db_connection.load_spend_sketches()
+        self._stored = {self._decode_key(key) for key in stored}
+        self._dirty = set()
+        self._write_count = self.db_connection.get_write_count('expense_entries')
+        if write_count == self._write_count:
+            self.sketches = {
+                self._decode_key(key): QuantileSketch.from_dict(json.loads(data))
+                for key, data in stored.items()
+            }
+            return
+
+        self.sketches = {}
+        for entry in entries:
+            self.add(entry)
+        self._dirty = set(self.sketches) | self._stored
+        self.db_connection.save_spend_sketches(self._take_updates(), self._write_count)
+
+    def add(self, entry) -> None:
+        for key in self._keys(entry):
+            sketch = self.sketches.get(key)
+            if sketch is None:
+                sketch = self.sketches[key] = QuantileSketch(self.relative_accuracy)
+            sketch.add(entry.amount)
+            self._dirty.add(key)
+
+    def remove(self, entry) -> None:
+        for key in self._keys(entry):
+            sketch = self.sketches.get(key)
+            try:
+                if sketch is None:
+                    raise ValueError(f"No sketch for {key}")
+                sketch.remove(entry.amount)
+            except ValueError:
+                # The entry never reached the sketches, e.g. it was added by another writer
+                self._write_count = None
+                continue
+            if not sketch.count:
+                del self.sketches[key]
+            self._dirty.add(key)
+
+    def record_write(self, cursor, table: str, changed_ids: list, deleted_ids: list) -> None:
+        """
+        before_commit hook of expense ledger writes: replace the loaded values
+        of the written rows by their stored ones and write the changed sketches
+        in the same transaction
+        """
+        if table != 'expense_entries':
+            return
+        if self._write_count is not None:
+            # The write being committed is counted already; anything more is another writer's
+            if self.db_connection.read_write_count(cursor, table) == self._write_count + 1:
+                self._write_count += 1
+            else:
+                self._write_count = None
+
+        for entry_id in [*deleted_ids, *changed_ids]:
+            entry = self.entry_lookup(entry_id)
+            if entry is not None:
+                self.remove(entry)
+        for _, amount, vendor, date, category, _ in self.db_connection.read_entries(cursor, table, changed_ids):
+            self.add(_StoredEntry(amount, vendor, date, category))
+        self.db_connection.write_spend_sketches(cursor, self._take_updates(), self._write_count)
+
+    def _take_updates(self) -> Dict[str, Optional[str]]:
+        """Serialized sketches changed since the last write, None for removed ones"""
+        updates = {}
+        for key in self._dirty:
+            sketch = self.sketches.get(key)
+            if sketch is not None:
+                updates[self._encode_key(key)] = json.dumps(sketch.to_dict())
+            elif key in self._stored:
+                updates[self._encode_key(key)] = None
+        self._stored = (self._stored | self._dirty) & set(self.sketches)
+        self._dirty = set()
+        return updates
+
+    @staticmethod
+    def _month_key(year: Optional[int], month: Optional[int]) -> str:
+        return f"{year}-{month:02d}" if year is not None and month is not None else ''
+
+    @staticmethod
+    def summarize(sketch: QuantileSketch) -> Dict[str, float]:
+        """Count, total, mean, median and 90th percentile of a sketch"""
+        return {
+            'count': sketch.count,
+            'total': sketch.total,
+            'mean': sketch.mean,
+            'median': sketch.quantile(0.5),
+            'p90': sketch.quantile(0.9)
+        }
+
+    def get_category_statistics(self, year: Optional[int] = None,
+                                month: Optional[int] = None) -> Dict[str, Dict[str, float]]:
+        """Statistics per category, for one month or for all time"""
+        month_key = self._month_key(year, month)
+        return {
+            name: self.summarize(sketch)
+            for (scope, key_month, name), sketch in sorted(self.sketches.items())
+            if scope == 'category' and key_month == month_key
+        }
+
+    def get_monthly_category_statistics(self) -> Dict[Tuple[int, int], Dict[str, Dict[str, float]]]:
+        """Statistics per category of every month, keyed by (year, month), in one pass"""
+        months = {}
+        for (scope, key_month, name), sketch in sorted(self.sketches.items()):
+            if scope == 'category' and key_month:
+                year, month = (int(part) for part in key_month.split('-'))
+                months.setdefault((year, month), {})[name] = self.summarize(sketch)
+        return months
+
+    def get_vendor_statistics(self, min_count: int = 1) -> Dict[str, Dict[str, float]]:
+        """All-time statistics per vendor with at least min_count entries"""
+        return {
+            name: self.summarize(sketch)
+            for (scope, _, name), sketch in sorted(self.sketches.items())
+            if scope == 'vendor' and sketch.count >= min_count
+        }
+
+    def get_month_distribution(self, year: int, month: int,
+                               quantiles: Tuple[float, ...] = (0.1, 0.25, 0.5, 0.75, 0.9)) -> Dict[str, float]:
+        """Quantiles of all expense amounts in a month, keyed 'p10', 'p25', ...; empty without entries"""
+        sketch = self.sketches.get(('month', self._month_key(year, month), ''))
+        if sketch is None:
+            return {}
+        return {f"p{round(q * 100)}": sketch.quantile(q) for q in quantiles}
+
+    def quantile(self, q: float, category: Optional[str] = None, vendor: Optional[str] = None,
+                 year: Optional[int] = None, month: Optional[int] = None) -> Optional[float]:
+        """
+        Approximate q-quantile of expense amounts of a category or vendor, or
+        of a whole month. None when there are no matching entries.
+        """
+        month_key = self._month_key(year, month)
+        if vendor is not None:
+            key = ('vendor', '', vendor.strip())
+        elif category is not None:
+            key = ('category', month_key, category.upper())
+        else:
+            key = ('month', month_key, '')
+        sketch = self.sketches.get(key)
+        return sketch.quantile(q) if sketch is not None else None
+
+    def outlier_threshold(self, category: str) -> Optional[float]:
+        """Amount above which a charge is unusual for its category, None with too few entries"""
+        sketch = self.sketches.get(('category', '', category.upper()))
+        if sketch is None or sketch.count < MIN_OUTLIER_COUNT:
+            return None
+        q1, q3 = sketch.quantile(0.25), sketch.quantile(0.75)
+        if q1 <= 0:
+            return q3 + OUTLIER_FENCE * (q3 - q1)
+        return q3 * (q3 / q1) ** OUTLIER_FENCE
+
+    def find_outliers(self, entries: Iterable) -> List:
+        """Entries whose amount is unusually high for their category"""
+        thresholds = {}
+        outliers = []
+        for entry in entries:
+            if entry.category not in thresholds:
+                thresholds[entry.category] = self.outlier_threshold(entry.category)
+            threshold = thresholds[entry.category]
+            if threshold is not None and entry.amount > threshold:
+                outliers.append(entry)
+        return outliers
+
+    def is_outlier(self, entry) -> bool:
+        return bool(self.find_outliers([entry]))
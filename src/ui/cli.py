@@ -1,20 +1,40 @@
 from src.income import IncomeManager
 from src.expenses import ExpenseManager
-from src.analytics import BudgetAnalyzer
+from src.analytics import BudgetAnalyzer, LedgerExporter
+from src.importers import StatementImporter
+from src.recurring import RecurringManager
 from .display import (
     display_menu,
     add_income_entry,
     add_expense_entry,
     add_custom_category_entry,
     display_summaries,
-    export_reports
+    export_reports,
+    import_statements,
+    add_categorization_rule_entry,
+    recategorize_history,
+    manage_entry,
+    export_ledger,
+    refresh_reports,
+    add_recurring_schedule_entry,
+    display_forecast,
+    display_spending_statistics
 )
 
 def run_cli(db_manager):
     """Main CLI loop"""
     income_manager = IncomeManager(db_manager)
     expense_manager = ExpenseManager(db_manager)
-    analyzer = BudgetAnalyzer(income_manager, expense_manager)
+    recurring_manager = RecurringManager(db_manager, income_manager, expense_manager)
+    analyzer = BudgetAnalyzer(income_manager, expense_manager, recurring_manager)
+    importer = StatementImporter(income_manager, expense_manager)
+    exporter = LedgerExporter(db_manager)
+
+    # Record recurring entries that fell due since the last run
+    income_result, expense_result = recurring_manager.materialize()
+    materialized = income_result.inserted + expense_result.inserted
+    if materialized:
+        print(f"\nAdded {materialized} recurring entries that fell due.")
 
     while True:
         choice = display_menu()
@@ -32,7 +52,18 @@ def run_cli(db_manager):
             "6": lambda: display_summaries("expense", expense_manager),
             "7": lambda: display_summaries("budget", income_manager, expense_manager),
             "8": lambda: export_reports(analyzer),
-            "9": lambda: display_summaries("categories", income_manager, expense_manager)
+            "9": lambda: display_summaries("categories", income_manager, expense_manager),
+            "10": lambda: import_statements(importer),
+            "11": lambda: add_categorization_rule_entry(income_manager, "Income"),
+            "12": lambda: add_categorization_rule_entry(expense_manager, "Expense"),
+            "13": lambda: recategorize_history(income_manager, expense_manager),
+            "14": lambda: manage_entry(income_manager, "Income"),
+            "15": lambda: manage_entry(expense_manager, "Expense"),
+            "16": lambda: export_ledger(exporter),
+            "17": lambda: refresh_reports(analyzer),
+            "18": lambda: add_recurring_schedule_entry(recurring_manager),
+            "19": lambda: display_forecast(analyzer),
+            "20": lambda: display_spending_statistics(analyzer)
         }
         
         action = actions.get(choice)
@@ -1,3 +1,9 @@
+from datetime import datetime
+from pathlib import Path
+from src.database import DuplicatePolicy
+from src.categorization import CategorizationRule, RuleType
+from src.recurring import RecurringSchedule, Cadence
+
 def display_menu():
     """Display main menu and get user choice"""
     print("\n=== Personal Budget Tracker ===")
@@ -10,6 +16,17 @@ def display_menu():
     print("7. View Budget Summary")
     print("8. Export Reports")
     print("9. View Categories")
+    print("10. Import Bank Statements")
+    print("11. Add Income Categorization Rule")
+    print("12. Add Expense Categorization Rule")
+    print("13. Recategorize History")
+    print("14. Edit or Delete Income Entry")
+    print("15. Edit or Delete Expense Entry")
+    print("16. Export Ledger to Parquet")
+    print("17. Refresh All Reports")
+    print("18. Add Recurring Schedule")
+    print("19. View Forecast")
+    print("20. View Spending Statistics")
     print("0. Exit")
     return input("Select an option: ")
 
@@ -28,7 +45,7 @@ def add_income_entry(manager):
     try:
         amount = float(input("Enter amount: $"))
         source = input("Enter source: ")
-        category = input("Enter category (from above list): ").upper()
+        category = input("Enter category (from above list, blank to categorize automatically): ").upper()
         description = input("Enter description (optional): ")
         
         entry = manager.add_income(
@@ -55,7 +72,7 @@ def add_expense_entry(manager):
     try:
         amount = float(input("Enter amount: $"))
         vendor = input("Enter vendor: ")
-        category = input("Enter category (from above list): ").upper()
+        category = input("Enter category (from above list, blank to categorize automatically): ").upper()
         description = input("Enter description (optional): ")
         
         entry = manager.add_expense(
@@ -131,4 +148,263 @@ def export_reports(analyzer):
     except ValueError:
         print("\nError: Please enter valid numbers for year and month.")
     except Exception as e:
-        print(f"\nError generating reports: {str(e)}")
\ No newline at end of file
+        print(f"\nError generating reports: {str(e)}")
+
+def import_statements(importer):
+    """Handle importing bank statement files"""
+    print("\nImporting Bank Statements")
+    try:
+        paths = []
+        for value in input("Enter statement files or folders (comma separated): ").split(","):
+            path = Path(value.strip()).expanduser()
+            if path.is_dir():
+                paths.extend(sorted(p for p in path.iterdir() if p.is_file()))
+            elif value.strip():
+                paths.append(path)
+        if not paths:
+            print("\nNo statement files given.")
+            return
+
+        print("\nDuplicate handling:")
+        for policy in DuplicatePolicy:
+            print(f"- {policy.name}: {policy.value}")
+        policy_name = input("Select duplicate handling [SKIP]: ").strip().upper() or "SKIP"
+        policy = DuplicatePolicy[policy_name]
+
+        summary = importer.import_files(paths, policy)
+        print(f"\nImported {summary.rows} rows from {summary.files - len(summary.errors)} of {summary.files} files")
+        for label, result in (("Income", summary.income), ("Expenses", summary.expenses)):
+            print(f"{label}: {result.inserted} added, {result.duplicates_skipped} duplicates skipped, "
+                  f"{result.duplicates_flagged} flagged, {result.duplicates_merged} merged, "
+                  f"{result.invalid} with invalid category")
+        for stage in summary.stages:
+            print(f"{stage.name.title():<10} {stage.seconds:>8.3f}s  {stage.rows_per_second:>12.0f} rows/sec")
+        for path, error in summary.errors.items():
+            print(f"Failed to import {path}: {error}")
+    except KeyError:
+        print("\nError: Unknown duplicate handling option.")
+    except Exception as e:
+        print(f"\nError importing statements: {str(e)}")
+
+def add_categorization_rule_entry(manager, type_str):
+    """Handle adding new categorization rule"""
+    print(f"\nAdding {type_str} Categorization Rule")
+    print("Rule types:")
+    for rule_type in RuleType:
+        print(f"- {rule_type.name}: {rule_type.value}")
+    try:
+        rule_type = RuleType[input("Enter rule type: ").strip().upper()]
+        pattern = ""
+        min_amount = max_amount = None
+        if rule_type is RuleType.AMOUNT:
+            min_text = input("Enter minimum amount (optional): $").strip()
+            max_text = input("Enter maximum amount (optional): $").strip()
+            min_amount = float(min_text) if min_text else None
+            max_amount = float(max_text) if max_text else None
+        else:
+            pattern = input("Enter pattern: ")
+        display_categories(manager, type_str)
+        category = input("Enter category (from above list): ").upper()
+        priority_text = input("Enter priority, lower wins (default 100): ").strip()
+
+        rule = manager.add_categorization_rule(CategorizationRule(
+            kind=type_str.lower(),
+            rule_type=rule_type,
+            category=category,
+            pattern=pattern,
+            min_amount=min_amount,
+            max_amount=max_amount,
+            priority=int(priority_text) if priority_text else 100
+        ))
+        if rule:
+            print(f"\n{type_str} categorization rule added successfully!")
+        else:
+            print(f"\nFailed to add {type_str.lower()} categorization rule.")
+    except KeyError:
+        print("\nError: Unknown rule type.")
+    except ValueError:
+        print("\nError: Please enter valid numbers for amounts and priority.")
+    except Exception as e:
+        print(f"\nError adding categorization rule: {str(e)}")
+
+def recategorize_history(income_manager, expense_manager):
+    """Handle applying categorization rules to all stored entries"""
+    try:
+        income_changed = income_manager.recategorize_history()
+        expenses_changed = expense_manager.recategorize_history()
+        print(f"\nRecategorized {income_changed} income and {expenses_changed} expense entries.")
+    except Exception as e:
+        print(f"\nError recategorizing entries: {str(e)}")
+
+def manage_entry(manager, type_str):
+    """Handle editing or deleting an existing entry"""
+    party_field = "source" if type_str == "Income" else "vendor"
+    entries = manager.get_all_income() if type_str == "Income" else manager.get_all_expenses()
+    print(f"\nRecent {type_str} Entries:")
+    for entry in sorted(entries, key=lambda e: e.date, reverse=True)[:10]:
+        print(f"[{entry.id}] {entry.date:%Y-%m-%d} {getattr(entry, party_field):<20} "
+              f"{entry.category:<15} ${entry.amount:>10.2f} {entry.description or ''}")
+    print("-" * 30)
+
+    try:
+        entry = manager.get_entry(int(input("Enter entry id: ")))
+        if entry is None:
+            print(f"\nNo {type_str.lower()} entry with that id.")
+            return
+
+        action = input("Edit or delete this entry? (e/d): ").strip().lower()
+        if action == "d":
+            if manager.delete_entry(entry.id):
+                print(f"\n{type_str} entry deleted successfully!")
+            return
+        if action != "e":
+            print("\nInvalid option.")
+            return
+
+        print("Leave a field blank to keep its current value.")
+        changes = {}
+        amount = input(f"Amount [{entry.amount:.2f}]: $").strip()
+        if amount:
+            changes["amount"] = float(amount)
+        party = input(f"{party_field.title()} [{getattr(entry, party_field)}]: ").strip()
+        if party:
+            changes[party_field] = party
+        date = input(f"Date (YYYY-MM-DD) [{entry.date:%Y-%m-%d}]: ").strip()
+        if date:
+            changes["date"] = datetime.strptime(date, "%Y-%m-%d").replace(
+                hour=entry.date.hour, minute=entry.date.minute, second=entry.date.second
+            )
+        category = input(f"Category [{entry.category}]: ").strip().upper()
+        if category:
+            changes["category"] = category
+        description = input(f"Description [{entry.description or ''}]: ").strip()
+        if description:
+            changes["description"] = description
+
+        if not changes:
+            print("\nNothing to update.")
+        elif manager.update_entry(entry.id, **changes):
+            print(f"\n{type_str} entry updated successfully!")
+        else:
+            print(f"\nFailed to update {type_str.lower()} entry.")
+    except ValueError:
+        print("\nError: Please enter a valid id, amount and date.")
+    except Exception as e:
+        print(f"\nError updating {type_str.lower()} entry: {str(e)}")
+
+def export_ledger(exporter):
+    """Handle exporting the raw ledger to Parquet"""
+    try:
+        full = input("Rewrite the full export instead of appending new rows? (y/N): ").strip().lower() == "y"
+        written = exporter.export(full=full)
+        print(f"\nLedger exported to {exporter.export_dir}:")
+        for table, rows in written.items():
+            print(f"{table}: {rows} rows written")
+    except Exception as e:
+        print(f"\nError exporting ledger: {str(e)}")
+
+def refresh_reports(analyzer):
+    """Handle regenerating the reports of months whose data changed"""
+    try:
+        result = analyzer.refresh_all_reports()
+        print(f"\nReports refreshed in {analyzer.reports_dir}:")
+        print(f"Regenerated: {', '.join(result['written']) or 'none'}")
+        print(f"Unchanged:   {len(result['skipped'])} months")
+    except Exception as e:
+        print(f"\nError refreshing reports: {str(e)}")
+
+def add_recurring_schedule_entry(recurring_manager):
+    """Handle adding new recurring schedule"""
+    print("\nAdding Recurring Schedule")
+    try:
+        kind = input("Income or expense? (i/e): ").strip().lower()
+        if kind not in ("i", "e"):
+            print("\nInvalid option.")
+            return
+        manager, type_str, party_field = (
+            (recurring_manager.income_manager, "Income", "source") if kind == "i"
+            else (recurring_manager.expense_manager, "Expense", "vendor")
+        )
+        display_categories(manager, type_str)
+
+        amount = float(input("Enter amount: $"))
+        party = input(f"Enter {party_field}: ")
+        category = input("Enter category (from above list): ").upper()
+        description = input("Enter description (optional): ")
+        print("Cadences: " + ", ".join(cadence.name for cadence in Cadence))
+        cadence = Cadence[input("Enter cadence: ").strip().upper()]
+        start_date = datetime.strptime(input("Enter start date (YYYY-MM-DD): ").strip(), "%Y-%m-%d")
+        end_text = input("Enter end date (YYYY-MM-DD, optional): ").strip()
+        end_date = datetime.strptime(end_text, "%Y-%m-%d") if end_text else None
+
+        schedule = recurring_manager.add_schedule(RecurringSchedule(
+            kind="income" if kind == "i" else "expense",
+            amount=amount,
+            party=party,
+            category=category,
+            cadence=cadence,
+            start_date=start_date,
+            end_date=end_date,
+            description=description
+        ))
+        if schedule:
+            income_result, expense_result = recurring_manager.materialize()
+            print("\nRecurring schedule added successfully!")
+            print(f"{income_result.inserted + expense_result.inserted} due entries added to the ledger.")
+        else:
+            print("\nFailed to add recurring schedule.")
+    except KeyError:
+        print("\nError: Unknown cadence.")
+    except ValueError:
+        print("\nError: Please enter a valid amount and dates.")
+    except Exception as e:
+        print(f"\nError adding recurring schedule: {str(e)}")
+
+def display_forecast(analyzer):
+    """Display the coming months including scheduled recurring entries"""
+    try:
+        months = int(input("Number of months ahead (default 3): ").strip() or 3)
+        print("\n=== FORECAST ===")
+        for data in analyzer.get_forecast(months)['monthly_forecast']:
+            print(f"{datetime(data['year'], data['month'], 1).strftime('%B %Y')}: "
+                  f"income ${data['total_income']:.2f}, expenses ${data['total_expenses']:.2f}, "
+                  f"savings ${data['savings']:.2f}")
+        print("-" * 30)
+    except ValueError:
+        print("\nError: Please enter a valid number of months.")
+    except Exception as e:
+        print(f"\nError building forecast: {str(e)}")
+
+def display_spending_statistics(analyzer):
+    """Display median and 90th percentile spend per category, unusual expenses of a month and top vendors"""
+    try:
+        year = int(input("Enter year (YYYY): "))
+        month = int(input("Enter month (1-12): "))
+
+        statistics = analyzer.get_spending_statistics(year, month)
+        print(f"\n=== SPENDING STATISTICS {datetime(year, month, 1).strftime('%B %Y').upper()} ===")
+        if not statistics['categories']:
+            print("No expenses recorded for this month.")
+            return
+        for category, stats in statistics['categories'].items():
+            print(f"{category}: {stats['count']} entries, median ${stats['median']:.2f}, p90 ${stats['p90']:.2f}")
+        distribution = statistics['distribution']
+        print("All expenses: " + ", ".join(f"{name} ${value:.2f}" for name, value in distribution.items()))
+
+        unusual = analyzer.get_unusual_expenses(year, month)
+        if unusual:
+            print("\nUnusual expenses:")
+            for entry in unusual:
+                print(f"- {entry.date.strftime('%Y-%m-%d')} {entry.vendor}: ${entry.amount:.2f} ({entry.category})")
+
+        top_vendors = analyzer.get_top_vendors()
+        if top_vendors:
+            print("\nTop vendors (all time):")
+            for vendor, stats in top_vendors:
+                print(f"- {vendor}: ${stats['total']:.2f} over {stats['count']} entries, "
+                      f"median ${stats['median']:.2f}")
+        print("-" * 30)
+    except ValueError:
+        print("\nError: Please enter valid numbers for year and month.")
+    except Exception as e:
+        print(f"\nError building statistics: {str(e)}")
@@ -0,0 +1,25 @@
+# tests/conftest.py
+from pathlib import Path
+import importlib
+import sys
+import pytest
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+try:
+    import src.settings  # noqa: F401
+except ImportError:
+    # No local settings.py: run against the example settings
+    sys.modules['src.settings'] = importlib.import_module('src.example_settings')
+
+from src.database import DatabaseManager
+
+
+@pytest.fixture
+def db(tmp_path):
+    return DatabaseManager(tmp_path / 'budget.db')
+
+
+def expense_data(amount, vendor, date, category='FOOD', description=''):
+    """Expense entry dictionary as stored by DatabaseManager"""
+    return {'amount': amount, 'vendor': vendor, 'category': category, 'date': date, 'description': description}
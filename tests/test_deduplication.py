@@ -0,0 +1,56 @@
+# tests/test_deduplication.py
+from datetime import datetime
+import pytest
+from src.database.deduplication import DuplicatePolicy
+from src.expenses import ExpenseManager, ExpenseEntry
+
+
+@pytest.fixture
+def manager(db):
+    manager = ExpenseManager(db)
+    manager.add_expense(25, 'Grocer', 'FOOD', 'Weekly shop', date=datetime(2024, 3, 2, 9, 0))
+    return manager
+
+
+def incoming():
+    # The first entry matches the stored one: same amount, vendor and day, cosmetic differences only
+    return [
+        ExpenseEntry(25, ' grocer. ', datetime(2024, 3, 2, 18, 30), 'transportation', 'WEEKLY SHOP'),
+        ExpenseEntry(7, 'Bakery', datetime(2024, 3, 4), 'food'),
+    ]
+
+
+def test_skip_drops_duplicates(manager):
+    result = manager.import_expenses(incoming(), DuplicatePolicy.SKIP)
+    assert (result.inserted, result.duplicates_skipped) == (1, 1)
+    assert result.entry_ids[0] is None
+    assert sorted(entry.amount for entry in manager.get_all_expenses()) == [7, 25]
+
+
+def test_flag_stores_duplicates_with_a_reference(manager, db):
+    stored_id = manager.get_all_expenses()[0].id
+    result = manager.import_expenses(incoming(), DuplicatePolicy.FLAG)
+    assert (result.inserted, result.duplicates_flagged) == (1, 1)
+    assert result.entry_ids[0] not in (None, stored_id)
+    assert db.add_expense_entries([incoming()[0].to_dict()], DuplicatePolicy.SKIP).duplicates_skipped == 1
+    assert len(manager.get_all_expenses()) == 3
+
+
+def test_merge_updates_the_matching_entry(manager):
+    stored = manager.get_all_expenses()[0]
+    result = manager.import_expenses(incoming(), DuplicatePolicy.MERGE)
+    assert (result.inserted, result.duplicates_merged) == (1, 1)
+    assert result.entry_ids[0] == stored.id and result.merged_ids == {stored.id}
+    assert (stored.category, stored.date) == ('TRANSPORTATION', datetime(2024, 3, 2, 18, 30))
+    assert len(manager.get_all_expenses()) == 2
+
+
+def test_import_leaves_caller_entries_untouched(manager):
+    entries = incoming() + [ExpenseEntry(3, 'Kiosk', datetime(2024, 3, 5), ''),
+                            ExpenseEntry(4, 'Kiosk', datetime(2024, 3, 6), 'NOT A CATEGORY')]
+    result = manager.import_expenses(entries, DuplicatePolicy.SKIP)
+    assert [entry.category for entry in entries] == ['transportation', 'food', '', 'NOT A CATEGORY']
+    assert all(entry.id is None for entry in entries)
+    assert result.invalid == 1
+    assert result.entry_ids[0] is None and result.entry_ids[3] is None
+    assert manager.get_entry(result.entry_ids[2]).category == 'OTHERS'
@@ -0,0 +1,31 @@
+# tests/test_entry_edits.py
+from datetime import datetime
+import pytest
+from conftest import expense_data
+from src.expenses import ExpenseManager
+
+
+def test_update_unknown_id_raises_without_changes(db):
+    entry_id = db.add_expense_entry(expense_data(10, 'Shop', '2024-01-05 09:00:00'))
+    updates = {
+        entry_id: expense_data(99, 'Shop', '2024-01-05 09:00:00'),
+        999: expense_data(5, 'Other', '2024-01-06 09:00:00'),
+    }
+    with pytest.raises(KeyError):
+        db.update_expense_entries(updates)
+    assert [row[1] for row in db.get_all_expense_entries()] == [10]
+
+
+def test_delete_keeps_loaded_order(db):
+    db.add_expense_entries([
+        expense_data(amount, f'Vendor {amount}', f'2024-01-{day:02d} 09:00:00')
+        for amount, day in ((1, 3), (2, 9), (3, 1), (4, 20), (5, 14))
+    ])
+    manager = ExpenseManager(db)
+    loaded = [entry.amount for entry in manager.get_all_expenses()]
+    assert loaded == [4, 5, 2, 1, 3]
+
+    manager.delete_entries([entry.id for entry in manager.get_all_expenses() if entry.amount in (4, 1)])
+    assert [entry.amount for entry in manager.get_all_expenses()] == [5, 2, 3]
+    assert [entry.amount for entry in ExpenseManager(db).get_all_expenses()] == [5, 2, 3]
+    assert all(manager.get_entry(entry.id) is entry for entry in manager.get_all_expenses())
@@ -0,0 +1,31 @@
+# tests/test_ledger_export.py
+from datetime import datetime
+import pytest
+from conftest import expense_data
+from src.analytics import LedgerExporter
+
+pytest.importorskip('pyarrow')
+
+
+@pytest.fixture
+def exporter(db, tmp_path):
+    db.add_expense_entries([
+        expense_data(10, 'Early', '2024-01-05 09:00:00'),
+        expense_data(20, 'Late', '2024-01-25 09:00:00'),
+        expense_data(30, 'Next', '2024-02-03 09:00:00'),
+    ])
+    exporter = LedgerExporter(db, tmp_path / 'ledger')
+    exporter.export()
+    return exporter
+
+
+def test_read_ledger_filters_boundary_partitions(exporter):
+    df = exporter.read_ledger('expense_entries', start=datetime(2024, 1, 10), end=datetime(2024, 2, 1))
+    assert df['vendor'].tolist() == ['Late']
+
+
+def test_read_ledger_filters_when_date_not_requested(exporter):
+    df = exporter.read_ledger('expense_entries', start=datetime(2024, 1, 10), end=datetime(2024, 2, 1),
+                              columns=['id', 'amount'])
+    assert list(df.columns) == ['id', 'amount']
+    assert df['amount'].tolist() == [20]
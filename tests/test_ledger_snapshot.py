@@ -0,0 +1,42 @@
+# tests/test_ledger_snapshot.py
+from conftest import expense_data
+from src.database import DatabaseManager
+
+
+def full_load(path):
+    return DatabaseManager(path, memory_replica=False, ledger_snapshot=False).load_ledger('expense_entries')
+
+
+def test_incremental_refresh_matches_full_load(tmp_path, monkeypatch):
+    path = tmp_path / 'budget.db'
+    db = DatabaseManager(path, memory_replica=False, ledger_snapshot=True)
+    db.add_expense_entries([
+        expense_data(amount, f'Vendor {amount}', f'2024-02-{day:02d} 09:00:00')
+        for amount, day in ((1, 10), (2, 20), (3, 15))
+    ])
+    assert db.load_ledger('expense_entries') == full_load(path)
+
+    # Appended rows, one of them backdated before every cached row and one sharing a date
+    db.add_expense_entries([
+        expense_data(4, 'Vendor 4', '2024-01-05 09:00:00'),
+        expense_data(5, 'Vendor 5', '2024-02-15 09:00:00'),
+        expense_data(6, 'Vendor 6', '2024-03-01 09:00:00'),
+    ])
+    reads = []
+    get_entries = db._get_entries
+
+    def recording_get_entries(table, after_id=0):
+        reads.append(after_id)
+        return get_entries(table, after_id)
+
+    monkeypatch.setattr(db, '_get_entries', recording_get_entries)
+    rows = db.load_ledger('expense_entries')
+    assert reads == [3]
+    assert rows == full_load(path)
+    assert [row[1] for row in rows] == [6, 2, 5, 3, 1, 4]
+
+    # Any other change rebuilds the snapshot in full
+    db.delete_expense_entries([rows[0][0]])
+    reads.clear()
+    assert db.load_ledger('expense_entries') == full_load(path)
+    assert reads == [0]
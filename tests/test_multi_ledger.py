@@ -0,0 +1,31 @@
+# tests/test_multi_ledger.py
+from datetime import datetime
+import pytest
+from conftest import expense_data
+from src.database import MultiLedgerManager
+
+
+@pytest.fixture
+def ledgers(tmp_path):
+    manager = MultiLedgerManager(ledgers={'alice': tmp_path / 'alice.db', 'bob': tmp_path / 'bob.db'})
+    manager.add_expense_entry(expense_data(10, 'Shop', '2024-02-01 09:00:00'), ledger='alice')
+    manager.add_expense_entry(expense_data(5, 'Shop', '2024-02-03 09:00:00'), ledger='bob')
+    return manager
+
+
+def test_aggregate_rejects_unknown_ledgers(ledgers):
+    with pytest.raises(ValueError, match="'carol'.*'alice', 'bob'"):
+        ledgers.aggregate(ledgers=['alice', 'carol'])
+
+
+def test_aggregate_stops_workers_outside_with_block(ledgers):
+    totals = ledgers.aggregate(datetime(2024, 2, 1), datetime(2024, 3, 1))
+    assert totals[('expense_entries', '2024-02', 'FOOD')] == [15, 2]
+    assert ledgers._executor is None
+
+    with ledgers:
+        ledgers.aggregate()
+        executor = ledgers._executor
+        ledgers.aggregate()
+        assert executor is not None and ledgers._executor is executor
+    assert ledgers._executor is None
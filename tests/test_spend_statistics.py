@@ -0,0 +1,47 @@
+# tests/test_spend_statistics.py
+from datetime import datetime
+from src.expenses import ExpenseManager, ExpenseEntry
+from src.database.deduplication import DuplicatePolicy
+from src.stats import SpendStatistics
+
+
+def rebuilt_sketches(manager):
+    statistics = SpendStatistics(manager.db_connection, manager.get_entry)
+    for entry in manager.get_all_expenses():
+        statistics.add(entry)
+    return sketch_dicts(statistics)
+
+
+def sketch_dicts(statistics):
+    return {key: sketch.to_dict() for key, sketch in statistics.sketches.items()}
+
+
+def test_sketches_follow_every_write(db):
+    manager = ExpenseManager(db)
+    first = manager.add_expense(12.5, 'Grocer', 'FOOD', date=datetime(2024, 1, 3))
+    manager.add_expense(40, 'Cinema', 'ENTERTAINMENT', date=datetime(2024, 2, 7))
+    manager.import_expenses([
+        ExpenseEntry(12.5, 'Grocer', datetime(2024, 1, 3), 'FOOD'),
+        ExpenseEntry(8, 'Bakery', datetime(2024, 2, 1), 'FOOD'),
+    ], DuplicatePolicy.MERGE)
+    manager.update_entry(first.id, amount=30, vendor='Market')
+    manager.delete_entry(first.id)
+    assert sketch_dicts(manager.statistics) == rebuilt_sketches(manager)
+
+    # The sketches were stored with each write and match the ledger, so they are loaded as is
+    reloaded = ExpenseManager(db)
+    assert reloaded.statistics._write_count == db.get_write_count('expense_entries')
+    assert sketch_dicts(reloaded.statistics) == sketch_dicts(manager.statistics)
+
+
+def test_write_by_another_manager_forces_rebuild(db):
+    manager = ExpenseManager(db)
+    other = ExpenseManager(db)
+    other.add_expense(20, 'Grocer', 'FOOD', date=datetime(2024, 1, 3))
+    manager.add_expense(5, 'Bakery', 'FOOD', date=datetime(2024, 1, 4))
+    assert manager.statistics._write_count is None
+
+    reloaded = ExpenseManager(db)
+    assert sorted(entry.amount for entry in reloaded.get_all_expenses()) == [5, 20]
+    assert sketch_dicts(reloaded.statistics) == rebuilt_sketches(reloaded)
+    assert reloaded.statistics.get_category_statistics()['FOOD']['count'] == 2
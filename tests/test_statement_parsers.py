@@ -0,0 +1,22 @@
+# tests/test_statement_parsers.py
+import pytest
+from src.importers.statement_parsers import parse_amount
+
+
+@pytest.mark.parametrize('value, expected', [
+    ('1,500', 1500),
+    ('1.500', 1.5),
+    ('1.234,50', 1234.5),
+    ('-1,234.50', -1234.5),
+    ('1.234.567', 1234567),
+    ('12,5', 12.5),
+    ('(12.00)', -12),
+    ('€ 1.234,50', 1234.5),
+])
+def test_parse_amount_detects_separators(value, expected):
+    assert parse_amount(value) == pytest.approx(expected)
+
+
+def test_parse_amount_with_explicit_separator():
+    assert parse_amount('1.500', decimal_separator=',') == 1500
+    assert parse_amount('1,500', decimal_separator=',') == pytest.approx(1.5)